@@ -10,6 +10,7 @@ from database.db import init_db
 from utils.file_parser import parse_file, clean_text
 from utils.skill_extractor import extract_skills_with_confidence, highlight_text
 from utils.comparator import compare_skills_advanced
+from utils.job_profile import register_job_profile
 from utils.visualizer import create_integrated_visualizations
 from utils.recommender import get_smart_recommendations
 from utils.report_generator import generate_advanced_pdf_report, generate_csv_report
@@ -384,23 +385,15 @@ def show_home_page():
         with preview_tab1:
             if st.button("🔍 Highlight Skills in Resume", key="highlight_resume"):
                 with st.spinner("Highlighting skills..."):
-                    temp_skills = extract_skills_with_confidence(st.session_state.resume_text)
-                    all_skills = []
-                    for cat_data in temp_skills.values():
-                        all_skills.extend(cat_data.keys())
-                    
-                    highlighted = highlight_text(st.session_state.resume_text, all_skills)
+                    _, spans = extract_skills_with_confidence(st.session_state.resume_text, return_spans=True)
+                    highlighted = highlight_text(st.session_state.resume_text, spans=spans)
                     st.markdown(f'<div class="highlight-box">{highlighted}</div>', unsafe_allow_html=True)
         
         with preview_tab2:
             if st.button("🔍 Highlight Skills in JD", key="highlight_jd"):
                 with st.spinner("Highlighting skills..."):
-                    temp_skills = extract_skills_with_confidence(st.session_state.jd_text)
-                    all_skills = []
-                    for cat_data in temp_skills.values():
-                        all_skills.extend(cat_data.keys())
-                    
-                    highlighted = highlight_text(st.session_state.jd_text, all_skills)
+                    _, spans = extract_skills_with_confidence(st.session_state.jd_text, return_spans=True)
+                    highlighted = highlight_text(st.session_state.jd_text, spans=spans)
                     st.markdown(f'<div class="highlight-box">{highlighted}</div>', unsafe_allow_html=True)
         
         # Step 3: Skill Extraction and Analysis
@@ -410,10 +403,11 @@ def show_home_page():
             with st.spinner("🤖 Running advanced ML analysis... This may take a moment."):
                 # Extract skills with confidence scores
                 resume_skills = extract_skills_with_confidence(st.session_state.resume_text)
-                jd_skills = extract_skills_with_confidence(st.session_state.jd_text)
+                jd_profile = register_job_profile(st.session_state.jd_text)
+                jd_skills = jd_profile.skills
                 
                 # Advanced comparison with TF-IDF
-                comparison = compare_skills_advanced(resume_skills, jd_skills)
+                comparison = compare_skills_advanced(resume_skills, jd_profile)
                 
                 # Get smart recommendations
                 recommendations = get_smart_recommendations(comparison)
@@ -0,0 +1,164 @@
+"""
+Tiered Cache Store
+Content-addressed cache with a bounded in-memory LRU tier and an optional
+on-disk tier with size-based LRU eviction
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def content_hash(*parts: str) -> str:
+    """
+    SHA-256 over one or more string parts
+
+    Args:
+        *parts: Strings to hash (joined with a NUL separator)
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for i, part in enumerate(parts):
+        if i:
+            digest.update(b'\x00')
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """
+    Key/value cache: memory LRU first, then (optionally) pickle files on disk
+
+    Memory is bounded by entry count. The disk tier is bounded by total
+    bytes; file modification times track recency and the least recently
+    used files are evicted first. Safe to share between Streamlit threads.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a key, promoting disk hits into memory
+
+        Args:
+            key: Cache key (e.g. from content_hash)
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove_file(path)
+            return None
+
+        self._put_memory(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        """
+        Store a value in memory and, if enabled, on disk
+
+        Args:
+            key: Cache key
+            value: Picklable value
+        """
+        self._put_memory(key, value)
+
+        if not self.disk_dir:
+            return
+
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            print(f"Could not write cache entry {key}: {e}")
+            if tmp_path:
+                self._remove_file(tmp_path)
+            return
+
+        self._evict_disk()
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith('.pkl'):
+                    self._remove_file(entry.path)
+
+    def _put_memory(self, key: str, value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Remove least recently used files until the tier fits its budget"""
+        entries = []
+        total = 0
+
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith('.pkl'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            self._remove_file(path)
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
\ No newline at end of file
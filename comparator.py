@@ -4,133 +4,475 @@ Uses TF-IDF + Cosine Similarity from your Milestone 3
 Plus set-based operations for comprehensive analysis
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+import heapq
+from itertools import islice
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import Dict, List
+from scipy import sparse
+from typing import Dict, Hashable, Iterable, List, Tuple
+from utils.skill_extractor import get_skill_registry, get_taxonomy_index
+from utils.skill_ann import FuzzySkillIndex, char_ngram_vectors
+from utils.skill_bitset import ProfileBitset, from_bitset, overlap_bitsets
+from utils.skill_frequency import get_frequency_model
+from utils.skill_registry import SkillRegistry
+from utils.taxonomy_index import load_artifact
 
-def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]], 
-                           jd_skills: Dict[str, Dict[str, int]]) -> Dict:
+# Bump whenever the vectorizer settings change so persisted models are rebuilt
+VECTORIZER_VERSION = 1
+
+# Bump whenever the similarity table layout or pruning rule changes
+SIMILARITY_TABLE_VERSION = 1
+
+# Three-tier classification thresholds (from Milestone 3)
+MATCH_THRESHOLD = 0.85
+PARTIAL_THRESHOLD = 0.50
+
+# Sort order of missing-skill priorities
+PRIORITY_ORDER = {'Critical': 0, 'High': 1, 'Medium': 2}
+
+# Neighbours kept per skill below PARTIAL_THRESHOLD in the similarity table
+SIMILARITY_TOP_K = 20
+
+# Candidates scored per sparse batch when ranking resumes against a JD
+RANKING_BATCH_SIZE = 512
+
+# Similarity modes: "tfidf" uses the taxonomy-fitted model and similarity
+# table, "hashing" a fixed-width HashingVectorizer with no fitted state
+SIMILARITY_MODES = ("tfidf", "hashing")
+
+# Width of the stateless hashing space (collisions are negligible at this size)
+HASHING_FEATURES = 2 ** 18
+
+# Neighbours fetched from the fuzzy index per out-of-taxonomy skill
+FUZZY_NEIGHBOURS = 25
+
+_skill_vectorizer = None
+_hashing_vectorizer = None
+_similarity_table = None
+_fuzzy_index = None
+
+def get_skill_vectorizer() -> TfidfVectorizer:
     """
-    Advanced skill comparison using TF-IDF + Cosine Similarity
-    Plus traditional set-based comparison
+    TF-IDF model fitted once over the whole skill taxonomy
+    
+    The vocabulary and IDF weights no longer depend on which resume and JD
+    are being compared, so scores are stable across candidates. The fitted
+    model is persisted next to the taxonomy index, keyed by taxonomy hash.
+    
+    Returns:
+        TfidfVectorizer: Fitted vectorizer (transform only)
+    """
+    global _skill_vectorizer
+    
+    if _skill_vectorizer is None:
+        index = get_taxonomy_index()
+        
+        def build():
+            vectorizer = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b")
+            vectorizer.fit(index.skills)
+            return vectorizer
+        
+        _skill_vectorizer = load_artifact(
+            "skill_vectorizer", index.taxonomy_hash, build, version=VECTORIZER_VERSION
+        )
+    
+    return _skill_vectorizer
+
+def get_hashing_vectorizer() -> HashingVectorizer:
+    """
+    Stateless word vectorizer for the "hashing" similarity mode
+    
+    Nothing is fitted, so every process produces identical vectors and
+    workers can score resume / JD pairs without sharing a model.
+    
+    Returns:
+        HashingVectorizer: Fixed-width, L2-normalized vectorizer
+    """
+    global _hashing_vectorizer
+    
+    if _hashing_vectorizer is None:
+        _hashing_vectorizer = HashingVectorizer(
+            token_pattern=r"(?u)\b\w+\b", n_features=HASHING_FEATURES,
+            alternate_sign=False, norm='l2'
+        )
+    
+    return _hashing_vectorizer
+
+def _check_similarity_mode(similarity_mode: str):
+    """Validate a similarity mode argument"""
+    if similarity_mode not in SIMILARITY_MODES:
+        raise ValueError(
+            f"Unknown similarity mode: {similarity_mode!r} (expected one of {SIMILARITY_MODES})"
+        )
+
+def _build_similarity_table(index, vectorizer: TfidfVectorizer) -> sparse.csr_matrix:
+    """
+    Cosine similarities between all taxonomy skills, pruned to a sparse table
+    
+    Every pair at or above PARTIAL_THRESHOLD is kept, so matched/partial
+    classification is exact; below that only each skill's SIMILARITY_TOP_K
+    nearest neighbours are kept.
+    """
+    vectors = vectorizer.transform(index.skills)
+    similarities = cosine_similarity(vectors)
+    np.fill_diagonal(similarities, 1.0)
+    
+    keep = similarities >= PARTIAL_THRESHOLD
+    
+    k = min(SIMILARITY_TOP_K, len(index.skills))
+    if k:
+        nearest = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        keep[np.arange(len(index.skills))[:, None], nearest] = True
+    
+    keep &= similarities > 0
+    
+    return sparse.csr_matrix(np.where(keep, similarities, 0.0))
+
+def get_similarity_table() -> sparse.csr_matrix:
+    """
+    Precomputed sparse skill-to-skill similarity table over the taxonomy
+    
+    Rows and columns are taxonomy skill IDs (which equal registry IDs). The
+    table is persisted next to the taxonomy index and rebuilt whenever the
+    taxonomy hash changes.
+    
+    Returns:
+        csr_matrix: (n_skills, n_skills) cosine similarities
+    """
+    global _similarity_table
+    
+    if _similarity_table is None:
+        index = get_taxonomy_index()
+        _similarity_table = load_artifact(
+            "skill_similarity", index.taxonomy_hash,
+            lambda: _build_similarity_table(index, get_skill_vectorizer()),
+            version=SIMILARITY_TABLE_VERSION
+        )
+    
+    return _similarity_table
+
+def get_fuzzy_index() -> FuzzySkillIndex:
+    """
+    Character n-gram LSH index over the taxonomy and user-added skills
+    
+    Returns:
+        FuzzySkillIndex: Shared index keyed by registry ID
+    """
+    global _fuzzy_index
+    
+    if _fuzzy_index is None:
+        index = FuzzySkillIndex(get_skill_registry())
+        index.add_many(get_taxonomy_index().skills)
+        _fuzzy_index = index
+    
+    return _fuzzy_index
+
+def add_custom_skills(skills: List[str]) -> List[int]:
+    """
+    Register free-form skills so they can be fuzzy-matched like taxonomy skills
     
     Args:
-        resume_skills: {category: {skill: confidence}}
-        jd_skills: {category: {skill: confidence}}
+        skills: Skill names
     
     Returns:
-        dict: Comprehensive comparison results
+        list: Registry IDs of the skills
     """
+    return get_fuzzy_index().add_many(skills)
+
+def _apply_fuzzy_matches(similarity_matrix: np.ndarray, resume_ids: np.ndarray,
+                         jd_ids: np.ndarray, resume_known: np.ndarray,
+                         jd_known: np.ndarray):
+    """
+    Raise out-of-taxonomy similarities to their character n-gram similarity
+    
+    Word TF-IDF scores spelling variants ("Postgres" / "PostgreSQL") as
+    unrelated. Each out-of-taxonomy skill is looked up in the fuzzy index
+    (taxonomy and custom skills) without being added to it, and only
+    neighbours at or above PARTIAL_THRESHOLD that appear on the other side
+    of the matrix are updated. Pairs of out-of-taxonomy skills are scored
+    directly, since neither side is in the index.
+    """
+    fuzzy_index = get_fuzzy_index()
+    registry = get_skill_registry()
+    
+    jd_columns = {}
+    for col, skill_id in enumerate(jd_ids.tolist()):
+        jd_columns.setdefault(skill_id, []).append(col)
+    resume_rows = {}
+    for row, skill_id in enumerate(resume_ids.tolist()):
+        resume_rows.setdefault(skill_id, []).append(row)
+    
+    def neighbours(skill_id):
+        return fuzzy_index.query(
+            registry.canonical(skill_id), k=FUZZY_NEIGHBOURS, min_similarity=PARTIAL_THRESHOLD
+        )
+    
+    unknown_rows = np.flatnonzero(~resume_known)
+    unknown_cols = np.flatnonzero(~jd_known)
+    
+    for row in unknown_rows:
+        for neighbour_id, similarity in neighbours(resume_ids[row]):
+            for col in jd_columns.get(neighbour_id, ()):
+                similarity_matrix[row, col] = max(similarity_matrix[row, col], similarity)
     
-    # Flatten skills for comparison
-    resume_skills_flat = {}
-    jd_skills_flat = {}
+    for col in unknown_cols:
+        for neighbour_id, similarity in neighbours(jd_ids[col]):
+            for row in resume_rows.get(neighbour_id, ()):
+                similarity_matrix[row, col] = max(similarity_matrix[row, col], similarity)
+    
+    if len(unknown_rows) and len(unknown_cols):
+        fuzzy = (
+            char_ngram_vectors(registry.canonical(i) for i in resume_ids[unknown_rows].tolist())
+            @ char_ngram_vectors(registry.canonical(i) for i in jd_ids[unknown_cols].tolist()).T
+        ).toarray()
+        fuzzy[fuzzy < PARTIAL_THRESHOLD] = 0.0
+        block = np.ix_(unknown_rows, unknown_cols)
+        similarity_matrix[block] = np.maximum(similarity_matrix[block], fuzzy)
+
+def _hashing_similarity_matrix(resume_ids: np.ndarray, jd_ids: np.ndarray) -> np.ndarray:
+    """Cosine similarities of hashed word vectors (no fitted state involved)"""
+    registry = get_skill_registry()
+    vectorizer = get_hashing_vectorizer()
+    
+    resume_vectors = vectorizer.transform([registry.canonical(i) for i in resume_ids])
+    jd_vectors = vectorizer.transform([registry.canonical(i) for i in jd_ids])
+    
+    # Rows are unit length, so the sparse product is the cosine similarity
+    similarity_matrix = (resume_vectors @ jd_vectors.T).toarray()
+    similarity_matrix[np.equal.outer(resume_ids, jd_ids)] = 1.0
+    
+    return similarity_matrix
+
+def skill_similarity_matrix(resume_skill_ids: List[int], jd_skill_ids: List[int],
+                            similarity_mode: str = "tfidf") -> np.ndarray:
+    """
+    Dense resume x JD similarity matrix
     
-    for category, skills in resume_skills.items():
+    In "tfidf" mode it is assembled from the similarity table. Skills
+    outside the taxonomy are not in the table; only their rows and columns
+    are vectorized on the fly with the taxonomy-wide TF-IDF model, then
+    raised to their fuzzy (character n-gram) similarity where higher.
+    
+    In "hashing" mode every skill is vectorized with the stateless
+    hashing vectorizer, so results do not depend on any fitted model.
+    
+    Args:
+        resume_skill_ids: Interned resume skill IDs
+        jd_skill_ids: Interned JD skill IDs
+        similarity_mode: One of SIMILARITY_MODES
+    
+    Returns:
+        np.ndarray: (len(resume_skill_ids), len(jd_skill_ids)) similarities
+    """
+    _check_similarity_mode(similarity_mode)
+    
+    if similarity_mode == "hashing":
+        return _hashing_similarity_matrix(
+            np.asarray(resume_skill_ids, dtype=np.int64), np.asarray(jd_skill_ids, dtype=np.int64)
+        )
+    
+    table = get_similarity_table()
+    n_known = table.shape[0]
+    
+    resume_ids = np.asarray(resume_skill_ids, dtype=np.int64)
+    jd_ids = np.asarray(jd_skill_ids, dtype=np.int64)
+    resume_known = resume_ids < n_known
+    jd_known = jd_ids < n_known
+    
+    similarity_matrix = np.zeros((len(resume_ids), len(jd_ids)))
+    
+    if resume_known.any() and jd_known.any():
+        similarity_matrix[np.ix_(resume_known, jd_known)] = (
+            table[resume_ids[resume_known]][:, jd_ids[jd_known]].toarray()
+        )
+    
+    if not (resume_known.all() and jd_known.all()):
+        registry = get_skill_registry()
+        vectorizer = get_skill_vectorizer()
+        resume_vectors = vectorizer.transform([registry.canonical(i) for i in resume_ids])
+        jd_vectors = vectorizer.transform([registry.canonical(i) for i in jd_ids])
+        
+        if not resume_known.all():
+            similarity_matrix[~resume_known, :] = cosine_similarity(
+                resume_vectors[np.flatnonzero(~resume_known)], jd_vectors
+            )
+        if not jd_known.all():
+            similarity_matrix[:, ~jd_known] = cosine_similarity(
+                resume_vectors, jd_vectors[np.flatnonzero(~jd_known)]
+            )
+        
+        _apply_fuzzy_matches(similarity_matrix, resume_ids, jd_ids, resume_known, jd_known)
+    
+    # Identical skills always match, even when their words are outside
+    # the taxonomy vocabulary (and so have all-zero vectors)
+    similarity_matrix[np.equal.outer(resume_ids, jd_ids)] = 1.0
+    
+    return similarity_matrix
+
+def _flatten_skills(skills_dict: Dict[str, Dict[str, int]],
+                    registry: SkillRegistry) -> Dict[int, Dict]:
+    """
+    Flatten a categorized skill profile into {skill_id: {category, confidence}}
+    
+    Args:
+        skills_dict: {category: {skill: confidence}}
+        registry: Shared skill registry
+    
+    Returns:
+        dict: Flat profile keyed by interned skill ID
+    """
+    flat = {}
+    for category, skills in skills_dict.items():
         for skill, conf in skills.items():
-            resume_skills_flat[skill.lower()] = {
+            flat[registry.intern(skill)] = {
                 'category': category,
                 'confidence': conf
             }
+    return flat
+
+def _jd_parts(jd_skills, registry: SkillRegistry):
+    """
+    Categorized skills, flat profile, bitset and missing-skill priorities of a JD
     
-    for category, skills in jd_skills.items():
-        for skill, conf in skills.items():
-            jd_skills_flat[skill.lower()] = {
-                'category': category,
-                'confidence': conf
+    A compiled JobProfile is used as is; a plain dict is flattened here
+    (its bitset and priorities are left as None for the caller to compute).
+    """
+    if isinstance(jd_skills, dict):
+        return jd_skills, _flatten_skills(jd_skills, registry), None, None
+    return jd_skills.skills, jd_skills.flat, jd_skills.bitset, jd_skills.priorities
+
+def _category_breakdown(resume_skills: Dict[str, Dict[str, int]], resume_bits: ProfileBitset,
+                        jd_skills: Dict[str, Dict[str, int]], jd_bits: ProfileBitset,
+                        registry: SkillRegistry) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Exact matched/missing/extra skills per category, from profile bitsets
+    
+    Returns:
+        dict: {category: {'matched', 'missing', 'extra': sorted display names}}
+            for every category with at least one skill on either side
+    """
+    category_breakdown = {}
+    all_categories = set(list(resume_skills.keys()) + list(jd_skills.keys()))
+    
+    for category in all_categories:
+        cat_bits = overlap_bitsets(resume_bits.category(category), jd_bits.category(category))
+        
+        if any(bits.any() for bits in cat_bits.values()):
+            category_breakdown[category] = {
+                name: sorted(registry.display_many(from_bitset(bits).tolist()))
+                for name, bits in cat_bits.items()
             }
     
-    resume_skill_list = list(resume_skills_flat.keys())
-    jd_skill_list = list(jd_skills_flat.keys())
+    return category_breakdown
+
+def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]], 
+                           jd_skills: Dict[str, Dict[str, int]],
+                           similarity_mode: str = "tfidf") -> Dict:
+    """
+    Advanced skill comparison using TF-IDF + Cosine Similarity
+    Plus traditional set-based comparison
+    
+    Args:
+        resume_skills: {category: {skill: confidence}}
+        jd_skills: {category: {skill: confidence}} or a compiled JobProfile
+        similarity_mode: "tfidf" (taxonomy-fitted model, default) or
+            "hashing" (stateless, reproducible across processes)
+    
+    Returns:
+        dict: Comprehensive comparison results
+    """
+    _check_similarity_mode(similarity_mode)
+    registry = get_skill_registry()
+    
+    # Flatten skills for comparison (keyed by interned skill ID)
+    resume_skills_flat = _flatten_skills(resume_skills, registry)
+    jd_skills, jd_skills_flat, jd_bits, jd_priorities = _jd_parts(jd_skills, registry)
+    
+    resume_skill_ids = list(resume_skills_flat.keys())
+    jd_skill_ids = list(jd_skills_flat.keys())
     
     # ========================================
     # Method 1: TF-IDF + Cosine Similarity
     # ========================================
     matched_skills = []
     partial_skills = []
+    partial_skill_ids = []
     missing_skills = []
     extra_skills = []
     similarity_scores = {}
     
-    if resume_skill_list and jd_skill_list:
-        all_skills = resume_skill_list + jd_skill_list
+    if resume_skill_ids and jd_skill_ids:
+        resume_skill_list = [registry.canonical(i) for i in resume_skill_ids]
+        jd_skill_list = [registry.canonical(i) for i in jd_skill_ids]
         
-        # Create TF-IDF vectors
-        vectorizer = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b")
+        # Similarities from the precomputed taxonomy table (or the hashing space)
         try:
-            skill_vectors = vectorizer.fit_transform(all_skills)
+            similarity_matrix = skill_similarity_matrix(resume_skill_ids, jd_skill_ids, similarity_mode)
             
-            resume_vectors = skill_vectors[:len(resume_skill_list)]
-            jd_vectors = skill_vectors[len(resume_skill_list):]
+            # Column reductions: best resume match for every JD skill at once
+            best_similarity = similarity_matrix.max(axis=0)
+            best_match_idx = similarity_matrix.argmax(axis=0)
             
-            # Calculate similarity matrix
-            similarity_matrix = cosine_similarity(resume_vectors, jd_vectors)
+            # Row reduction: best JD match for every resume skill at once
+            max_similarity_to_jd = similarity_matrix.max(axis=1)
             
-            # Classify each JD skill
-            for jd_idx, jd_skill in enumerate(jd_skill_list):
-                max_similarity = similarity_matrix[:, jd_idx].max()
-                best_match_idx = similarity_matrix[:, jd_idx].argmax()
-                best_resume_skill = resume_skill_list[best_match_idx]
-                
-                similarity_scores[jd_skill] = {
-                    'similarity': max_similarity,
-                    'best_match': best_resume_skill
+            # Three-tier classification (from your Milestone 3)
+            matched_mask = best_similarity >= MATCH_THRESHOLD  # High similarity = Matched
+            partial_mask = ~matched_mask & (best_similarity >= PARTIAL_THRESHOLD)  # Medium = Partial
+            missing_mask = ~(matched_mask | partial_mask)  # Low similarity = Missing
+            
+            jd_id_array = np.asarray(jd_skill_ids)
+            matched_skills = jd_id_array[matched_mask].tolist()
+            missing_skills = jd_id_array[missing_mask].tolist()
+            partial_skill_ids = jd_id_array[partial_mask].tolist()
+            
+            partial_skills = [
+                {
+                    'skill': jd_skill_list[jd_idx],
+                    'similarity': best_similarity[jd_idx],
+                    'closest_match': resume_skill_list[best_match_idx[jd_idx]]
                 }
-                
-                # Three-tier classification (from your Milestone 3)
-                if max_similarity >= 0.85:  # High similarity = Matched
-                    matched_skills.append(jd_skill)
-                elif max_similarity >= 0.50:  # Medium similarity = Partial
-                    partial_skills.append({
-                        'skill': jd_skill,
-                        'similarity': max_similarity,
-                        'closest_match': best_resume_skill
-                    })
-                else:  # Low similarity = Missing
-                    missing_skills.append(jd_skill)
+                for jd_idx in np.flatnonzero(partial_mask)
+            ]
+            
+            similarity_scores = {
+                jd_skill: {
+                    'similarity': best_similarity[jd_idx],
+                    'best_match': resume_skill_list[best_match_idx[jd_idx]]
+                }
+                for jd_idx, jd_skill in enumerate(jd_skill_list)
+            }
             
             # Find extra skills (in resume but not in JD)
-            for resume_skill in resume_skill_list:
-                resume_idx = resume_skill_list.index(resume_skill)
-                max_similarity_to_jd = similarity_matrix[resume_idx, :].max()
-                
-                if max_similarity_to_jd < 0.50:
-                    extra_skills.append(resume_skill)
+            extra_skills = np.asarray(resume_skill_ids)[max_similarity_to_jd < PARTIAL_THRESHOLD].tolist()
         
         except Exception as e:
             print(f"TF-IDF comparison error: {e}")
             # Fallback to simple set comparison
-            matched_skills = list(set(resume_skill_list) & set(jd_skill_list))
-            missing_skills = list(set(jd_skill_list) - set(resume_skill_list))
-            extra_skills = list(set(resume_skill_list) - set(jd_skill_list))
+            matched_skills = list(set(resume_skill_ids) & set(jd_skill_ids))
+            missing_skills = list(set(jd_skill_ids) - set(resume_skill_ids))
+            extra_skills = list(set(resume_skill_ids) - set(jd_skill_ids))
+    
+    elif jd_skill_ids:
+        # Nothing on the resume: every JD skill is missing
+        missing_skills = list(jd_skill_ids)
     
     # ========================================
     # Method 2: Category-wise Set Comparison
     # ========================================
-    category_breakdown = {}
+    # Packed bitsets over interned IDs: AND / ANDNOT instead of string sets
+    n_bits = len(registry)
+    resume_bits = ProfileBitset(resume_skills, registry, n_bits)
+    if jd_bits is None:
+        jd_bits = ProfileBitset(jd_skills, registry, n_bits)
     
-    all_categories = set(list(resume_skills.keys()) + list(jd_skills.keys()))
-    
-    for category in all_categories:
-        resume_cat = set(s.lower() for s in resume_skills.get(category, {}).keys())
-        jd_cat = set(s.lower() for s in jd_skills.get(category, {}).keys())
-        
-        cat_matched = resume_cat & jd_cat
-        cat_missing = jd_cat - resume_cat
-        cat_extra = resume_cat - jd_cat
-        
-        if cat_matched or cat_missing or cat_extra:
-            category_breakdown[category] = {
-                'matched': sorted([s.title() for s in cat_matched]),
-                'missing': sorted([s.title() for s in cat_missing]),
-                'extra': sorted([s.title() for s in cat_extra])
-            }
+    category_breakdown = _category_breakdown(resume_skills, resume_bits, jd_skills, jd_bits, registry)
     
     # ========================================
     # Calculate Overall Match Percentage
     # ========================================
-    total_jd_skills = len(jd_skill_list)
+    total_jd_skills = len(jd_skill_ids)
     total_matched = len(matched_skills)
     total_partial = len(partial_skills)
     
@@ -141,38 +483,40 @@ def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]],
     else:
         overall_match = 0
     
+    # Same credits weighted by corpus rarity (IDF), so rare required skills
+    # count for more; equals overall_match until the corpus is large enough
+    rarity_weighted_match = _rarity_weighted_match(jd_skill_ids, matched_skills, partial_skill_ids, registry)
+    
     # ========================================
     # Skill Confidence Mapping
     # ========================================
     skill_confidences = {}
-    for skill in matched_skills:
-        if skill in resume_skills_flat:
-            skill_confidences[skill.title()] = resume_skills_flat[skill]['confidence']
+    for skill_id in matched_skills:
+        if skill_id in resume_skills_flat:
+            skill_confidences[registry.display(skill_id)] = resume_skills_flat[skill_id]['confidence']
     
     # ========================================
     # Priority Classification for Missing Skills
     # ========================================
     missing_with_priority = []
-    for skill in missing_skills:
-        if skill in jd_skills_flat:
-            jd_conf = jd_skills_flat[skill]['confidence']
+    for skill_id in missing_skills:
+        if skill_id in jd_skills_flat:
+            jd_conf = jd_skills_flat[skill_id]['confidence']
             
-            if jd_conf >= 90:
-                priority = 'Critical'
-            elif jd_conf >= 75:
-                priority = 'High'
+            if jd_priorities is not None:
+                priority = jd_priorities[skill_id]
             else:
-                priority = 'Medium'
+                priority = get_missing_priority(jd_conf, registry.canonical(skill_id))
             
             missing_with_priority.append({
-                'skill': skill.title(),
+                'skill': registry.display(skill_id),
+                'skill_id': skill_id,
                 'priority': priority,
                 'jd_confidence': jd_conf
             })
     
     # Sort by priority
-    priority_order = {'Critical': 0, 'High': 1, 'Medium': 2}
-    missing_with_priority.sort(key=lambda x: priority_order[x['priority']])
+    missing_with_priority.sort(key=lambda x: PRIORITY_ORDER[x['priority']])
     
     # ========================================
     # Gap Analysis Score (from your Milestone 4)
@@ -197,6 +541,7 @@ def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]],
     return {
         # Core metrics
         'overall_match': overall_match,
+        'rarity_weighted_match': rarity_weighted_match,
         'avg_gap': avg_gap,
         'total_jd_skills': total_jd_skills,
         'total_matched': total_matched,
@@ -205,10 +550,10 @@ def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]],
         'total_extra': len(extra_skills),
         
         # Skill lists (title-cased for display)
-        'matched_skills': sorted([s.title() for s in matched_skills]),
+        'matched_skills': sorted(registry.display_many(matched_skills)),
         'partial_skills': partial_skills,  # List of dicts with similarity scores
-        'missing_skills': sorted([s.title() for s in missing_skills]),
-        'extra_skills': sorted([s.title() for s in extra_skills]),
+        'missing_skills': sorted(registry.display_many(missing_skills)),
+        'extra_skills': sorted(registry.display_many(extra_skills)),
         
         # Advanced data
         'missing_with_priority': missing_with_priority,
@@ -220,6 +565,361 @@ def compare_skills_advanced(resume_skills: Dict[str, Dict[str, int]],
         'classification': get_classification_message(overall_match)
     }
 
+def get_missing_priority(jd_confidence: int, skill: str = None) -> str:
+    """
+    Priority of a missing skill from the JD's extraction confidence
+    
+    When the skill is given, the confidence is first scaled up by its
+    demand: the share of processed JDs requiring it (see skill_frequency).
+    
+    Args:
+        jd_confidence (int): Confidence of the skill in the JD
+        skill (str): Skill name, to take corpus demand into account
+    
+    Returns:
+        str: 'Critical', 'High' or 'Medium'
+    """
+    if skill is not None:
+        jd_confidence *= get_frequency_model().priority_factor(skill)
+    
+    if jd_confidence >= 90:
+        return 'Critical'
+    elif jd_confidence >= 75:
+        return 'High'
+    else:
+        return 'Medium'
+
+def _rarity_weighted_match(jd_skill_ids: List[int], matched_ids: List[int],
+                           partial_ids: List[int], registry: SkillRegistry) -> float:
+    """
+    Match percentage with each JD skill weighted by its corpus IDF
+    
+    Args:
+        jd_skill_ids: Interned JD skill IDs
+        matched_ids: IDs of matched JD skills
+        partial_ids: IDs of partially matched JD skills
+        registry: Shared skill registry
+    
+    Returns:
+        float: Weighted match percentage (0 for an empty JD)
+    """
+    if not jd_skill_ids:
+        return 0
+    
+    weights = dict(zip(jd_skill_ids, get_frequency_model().match_weights(
+        [registry.canonical(skill_id) for skill_id in jd_skill_ids]
+    )))
+    credit = sum(weights[i] for i in matched_ids) + 0.5 * sum(weights[i] for i in partial_ids)
+    
+    return (credit / sum(weights.values())) * 100
+
+def compare_against_many(resume_skills: Dict[str, Dict[str, int]],
+                         jd_skills_list: List[Dict[str, Dict[str, int]]],
+                         similarity_mode: str = "tfidf") -> List[Dict]:
+    """
+    Compare one resume against many job descriptions in a single pass
+    
+    The resume is scored once against every distinct JD skill (one
+    similarity matrix over the union of JD skills). All JDs are then stacked
+    into one sparse JD x skill matrix, and per-JD matched/partial counts and
+    extra resume skills come from sparse matrix products. Classification
+    and match scores follow compare_skills_advanced.
+    
+    Args:
+        resume_skills: {category: {skill: confidence}}
+        jd_skills_list: JD profiles, each {category: {skill: confidence}} or
+            a compiled JobProfile
+        similarity_mode: One of SIMILARITY_MODES
+    
+    Returns:
+        list: One dict per JD, in input order, with the same keys and value
+            shapes as compare_skills_advanced
+    """
+    _check_similarity_mode(similarity_mode)
+    registry = get_skill_registry()
+    
+    resume_skills_flat = _flatten_skills(resume_skills, registry)
+    resume_skill_ids = list(resume_skills_flat.keys())
+    jd_parts = [_jd_parts(jd_skills, registry) for jd_skills in jd_skills_list]
+    
+    # Column space: every distinct skill used by any JD
+    column_of = {}
+    for _, jd_flat, _, _ in jd_parts:
+        for skill_id in jd_flat:
+            column_of.setdefault(skill_id, len(column_of))
+    column_ids = np.fromiter(column_of.keys(), dtype=np.int64, count=len(column_of))
+    
+    resume_skill_list = [registry.canonical(i) for i in resume_skill_ids]
+    column_list = [registry.canonical(i) for i in column_ids.tolist()]
+    
+    # Vectorize the resume once: best resume match for every JD skill, and
+    # which resume skills reach the partial threshold for it
+    if resume_skill_ids and len(column_ids):
+        similarity_matrix = skill_similarity_matrix(resume_skill_ids, column_ids, similarity_mode)
+        best_similarity = similarity_matrix.max(axis=0)
+        best_match_idx = similarity_matrix.argmax(axis=0)
+        column_reached_by = (similarity_matrix >= PARTIAL_THRESHOLD).T.astype(np.float64)
+    else:
+        best_similarity = np.zeros(len(column_ids))
+        best_match_idx = np.zeros(len(column_ids), dtype=np.int64)
+        column_reached_by = np.zeros((len(column_ids), len(resume_skill_ids)))
+    
+    matched_column = best_similarity >= MATCH_THRESHOLD
+    partial_column = ~matched_column & (best_similarity >= PARTIAL_THRESHOLD)
+    
+    # One sparse JD x skill matrix holding JD confidences
+    indptr = [0]
+    indices = []
+    confidences = []
+    for _, jd_flat, _, _ in jd_parts:
+        for skill_id, data in jd_flat.items():
+            indices.append(column_of[skill_id])
+            confidences.append(data['confidence'])
+        indptr.append(len(indices))
+    
+    jd_matrix = sparse.csr_matrix(
+        (np.asarray(confidences, dtype=np.float64), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(jd_parts), len(column_ids))
+    )
+    jd_indicator = jd_matrix.copy()
+    jd_indicator.data[:] = 1.0
+    
+    # Corpus rarity (IDF) weight of every column
+    column_weights = np.asarray(get_frequency_model().match_weights(column_list), dtype=np.float64)
+    column_credit = matched_column + partial_column * 0.5
+    
+    # Single matrix product: per-JD matched and partial counts, weighted
+    # credit and total weight
+    counts = jd_indicator @ np.column_stack([
+        matched_column, partial_column, column_weights * column_credit, column_weights
+    ]).astype(np.float64)
+    totals = np.diff(jd_matrix.indptr)
+    
+    # Per JD, how many of its skills each resume skill reaches; zero = extra
+    resume_reach = jd_indicator @ column_reached_by
+    
+    resume_id_array = np.asarray(resume_skill_ids, dtype=np.int64)
+    n_bits = len(registry)
+    resume_bits = ProfileBitset(resume_skills, registry, n_bits)
+    
+    results = []
+    for jd_idx, (jd_skills, jd_flat, jd_bits, jd_priorities) in enumerate(jd_parts):
+        row = slice(jd_matrix.indptr[jd_idx], jd_matrix.indptr[jd_idx + 1])
+        row_columns = jd_matrix.indices[row]
+        row_confidences = jd_matrix.data[row]
+        
+        total_jd_skills = int(totals[jd_idx])
+        total_matched = int(counts[jd_idx, 0])
+        total_partial = int(counts[jd_idx, 1])
+        
+        if total_jd_skills > 0:
+            overall_match = ((total_matched + total_partial * 0.5) / total_jd_skills) * 100
+            rarity_weighted_match = (counts[jd_idx, 2] / counts[jd_idx, 3]) * 100
+        else:
+            overall_match = 0
+            rarity_weighted_match = 0
+        
+        matched_ids = column_ids[row_columns[matched_column[row_columns]]].tolist()
+        
+        partial_skills = [
+            {
+                'skill': column_list[column],
+                'similarity': best_similarity[column],
+                'closest_match': resume_skill_list[best_match_idx[column]]
+            }
+            for column in row_columns[partial_column[row_columns]].tolist()
+        ]
+        
+        if resume_skill_ids and total_jd_skills:
+            similarity_scores = {
+                column_list[column]: {
+                    'similarity': best_similarity[column],
+                    'best_match': resume_skill_list[best_match_idx[column]]
+                }
+                for column in row_columns.tolist()
+            }
+            extra_ids = resume_id_array[resume_reach[jd_idx] == 0].tolist()
+        else:
+            similarity_scores = {}
+            extra_ids = []
+        
+        missing_mask = ~(matched_column[row_columns] | partial_column[row_columns])
+        missing_with_priority = [
+            {
+                'skill': registry.display(skill_id),
+                'skill_id': skill_id,
+                'priority': (
+                    jd_priorities[skill_id] if jd_priorities is not None
+                    else get_missing_priority(int(jd_conf), registry.canonical(skill_id))
+                ),
+                'jd_confidence': int(jd_conf)
+            }
+            for skill_id, jd_conf in zip(column_ids[row_columns[missing_mask]].tolist(),
+                                         row_confidences[missing_mask])
+        ]
+        missing_with_priority.sort(key=lambda x: PRIORITY_ORDER[x['priority']])
+        
+        # Gap analysis: no gap for matched skills, JD confidence for missing ones
+        gap_percentages = [0] * len(matched_ids) + [item['jd_confidence'] for item in missing_with_priority]
+        avg_gap = sum(gap_percentages) / len(gap_percentages) if gap_percentages else 0
+        
+        if jd_bits is None:
+            jd_bits = ProfileBitset(jd_skills, registry, n_bits)
+        
+        results.append({
+            'overall_match': overall_match,
+            'rarity_weighted_match': rarity_weighted_match,
+            'avg_gap': avg_gap,
+            'total_jd_skills': total_jd_skills,
+            'total_matched': total_matched,
+            'total_partial': total_partial,
+            'total_missing': len(missing_with_priority),
+            'total_extra': len(extra_ids),
+            'matched_skills': sorted(registry.display_many(matched_ids)),
+            'partial_skills': partial_skills,
+            'missing_skills': sorted(item['skill'] for item in missing_with_priority),
+            'extra_skills': sorted(registry.display_many(extra_ids)),
+            'missing_with_priority': missing_with_priority,
+            'similarity_scores': similarity_scores,
+            'category_breakdown': _category_breakdown(
+                resume_skills, resume_bits, jd_skills, jd_bits, registry
+            ),
+            'skill_confidences': {
+                registry.display(skill_id): resume_skills_flat[skill_id]['confidence']
+                for skill_id in matched_ids if skill_id in resume_skills_flat
+            },
+            'classification': get_classification_message(overall_match)
+        })
+    
+    return results
+
+def _score_candidate_batch(jd_skill_ids: np.ndarray, batch: List[Dict[int, Dict]],
+                           similarity_mode: str = "tfidf") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matched and partial JD-skill counts for a batch of flattened resumes
+    
+    The distinct resume skills of the batch are scored against the JD once.
+    A sparse candidate x skill indicator matrix then tells, through two
+    sparse products, whether any of a candidate's skills reaches the match
+    or partial threshold for each JD skill.
+    
+    Args:
+        jd_skill_ids: Interned JD skill IDs
+        batch: Flattened resume profiles ({skill_id: {...}})
+        similarity_mode: One of SIMILARITY_MODES
+    
+    Returns:
+        tuple: (matched counts, partial counts), one entry per candidate
+    """
+    row_of = {}
+    indptr = [0]
+    indices = []
+    for resume_flat in batch:
+        for skill_id in resume_flat:
+            indices.append(row_of.setdefault(skill_id, len(row_of)))
+        indptr.append(len(indices))
+    
+    if not row_of or not len(jd_skill_ids):
+        zeros = np.zeros(len(batch), dtype=np.int64)
+        return zeros, zeros
+    
+    row_ids = np.fromiter(row_of.keys(), dtype=np.int64, count=len(row_of))
+    similarity_matrix = skill_similarity_matrix(row_ids, jd_skill_ids, similarity_mode)
+    
+    resume_indicator = sparse.csr_matrix(
+        (np.ones(len(indices)), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(batch), len(row_ids))
+    )
+    
+    # A JD skill is matched (partial) when any resume skill reaches the threshold
+    matched = (resume_indicator @ (similarity_matrix >= MATCH_THRESHOLD)) > 0
+    at_least_partial = (resume_indicator @ (similarity_matrix >= PARTIAL_THRESHOLD)) > 0
+    
+    matched_counts = matched.sum(axis=1)
+    partial_counts = at_least_partial.sum(axis=1) - matched_counts
+    return matched_counts, partial_counts
+
+def rank_candidates(jd_skills: Dict[str, Dict[str, int]],
+                    candidates: Iterable[Tuple[Hashable, Dict[str, Dict[str, int]]]],
+                    top_k: int = 10,
+                    batch_size: int = RANKING_BATCH_SIZE,
+                    detailed: bool = False,
+                    similarity_mode: str = "tfidf") -> List[Dict]:
+    """
+    Rank many resumes against one job description and keep the best K
+    
+    Candidates are consumed lazily in batches, scored with sparse products
+    (see _score_candidate_batch) and pushed through a size-K min-heap, so
+    memory stays bounded by one batch plus K entries however long the
+    stream is. Scores follow compare_skills_advanced's overall_match.
+    
+    Args:
+        jd_skills: {category: {skill: confidence}} or a compiled JobProfile
+        candidates: Iterable of (candidate_id, resume skills) pairs
+        top_k: Number of candidates to return
+        batch_size: Candidates scored per batch
+        detailed: Also attach the full compare_skills_advanced result
+        similarity_mode: One of SIMILARITY_MODES
+    
+    Returns:
+        list: Up to top_k dicts (best first) with candidate_id,
+            overall_match, total_matched, total_partial, total_missing and
+            classification, plus 'comparison' when detailed is True.
+            Ties keep stream order.
+    """
+    _check_similarity_mode(similarity_mode)
+    
+    if top_k <= 0:
+        return []
+    
+    registry = get_skill_registry()
+    jd_skill_ids = np.fromiter(_jd_parts(jd_skills, registry)[1].keys(), dtype=np.int64)
+    total_jd_skills = len(jd_skill_ids)
+    
+    heap = []
+    seq = 0
+    candidates = iter(candidates)
+    
+    while True:
+        chunk = list(islice(candidates, batch_size))
+        if not chunk:
+            break
+        
+        batch = [_flatten_skills(resume_skills, registry) for _, resume_skills in chunk]
+        matched_counts, partial_counts = _score_candidate_batch(jd_skill_ids, batch, similarity_mode)
+        
+        if total_jd_skills > 0:
+            scores = (matched_counts + partial_counts * 0.5) / total_jd_skills * 100
+        else:
+            scores = np.zeros(len(chunk))
+        
+        for (candidate_id, resume_skills), score, matched, partial in zip(
+                chunk, scores.tolist(), matched_counts.tolist(), partial_counts.tolist()):
+            # Earlier candidates win ties, so the sequence number is negated
+            entry = (score, -seq, candidate_id, matched, partial, resume_skills)
+            seq += 1
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+    
+    ranking = []
+    for score, _, candidate_id, matched, partial, resume_skills in sorted(
+            heap, key=lambda entry: entry[:2], reverse=True):
+        result = {
+            'candidate_id': candidate_id,
+            'overall_match': score,
+            'total_matched': matched,
+            'total_partial': partial,
+            'total_missing': total_jd_skills - matched - partial,
+            'classification': get_classification_message(score)
+        }
+        if detailed:
+            result['comparison'] = compare_skills_advanced(resume_skills, jd_skills, similarity_mode)
+        ranking.append(result)
+    
+    return ranking
+
 def get_classification_message(match_percentage: float) -> str:
     """
     Get classification message based on match percentage
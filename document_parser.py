@@ -0,0 +1,893 @@
+"""
+Headless Document Parser
+Pure parsing layer for PDF, DOCX and TXT documents: no UI calls, every
+function returns a structured result, so parsing can run in worker
+processes, batch jobs or background queues
+"""
+
+import copy
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from PyPDF2 import PdfReader
+from docx import Document
+
+from utils.cache_store import TieredCache, content_hash
+from utils.process_context import get_process_context
+from utils.taxonomy_index import CACHE_DIR
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limits
+    resource = None
+
+# Bump whenever parsing output changes (keys persisted parse results)
+PARSER_VERSION = "2"
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_MIME_TYPE = "text/plain"
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tiff')
+
+# Main part of a DOCX package and the WordprocessingML tags read from it
+DOCX_DOCUMENT_PART = "word/document.xml"
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# PDFs with at least this many pages are fanned out to worker processes
+# when n_process is left to auto
+PARALLEL_PAGE_THRESHOLD = 16
+
+# Consecutive pages extracted per worker task
+PAGE_CHUNK_SIZE = 4
+
+# Default budgets of parse_document_isolated
+PARSE_TIMEOUT_SECONDS = 20.0
+PARSE_MEMORY_LIMIT_MB = 512
+
+# Isolated parse workers are reused: at most this many are kept idle, and
+# each is retired after this many documents (memory caps are fixed at start)
+PARSE_WORKER_IDLE_MAX = 2
+PARSE_WORKER_MAX_TASKS = 100
+
+# Time allowed for a new worker to come up (not charged to the parse budget)
+PARSE_WORKER_START_TIMEOUT = 60.0
+
+# Parse results kept in memory; the disk tier is bounded by size
+PARSE_CACHE_SIZE = 128
+PARSE_CACHE_DISK_BYTES = 128 * 1024 * 1024
+
+# Parse statuses
+STATUS_OK = "ok"                    # Text extracted
+STATUS_EMPTY = "empty"              # Document readable but has no text
+STATUS_ENCRYPTED = "encrypted"      # Password-protected PDF
+STATUS_UNSUPPORTED = "unsupported"  # Image, legacy or unknown format
+STATUS_ERROR = "error"              # Document could not be read
+STATUS_TIMEOUT = "timeout"          # Time budget exceeded (text may be partial)
+STATUS_MEMORY_LIMIT = "memory_limit"  # Memory budget exceeded (text may be partial)
+
+# Outcomes that depend only on the file bytes; budget failures and errors
+# (which include crashed workers) are retried on the next upload
+CACHEABLE_STATUSES = (STATUS_OK, STATUS_EMPTY, STATUS_ENCRYPTED)
+
+_parse_cache = None
+
+_idle_workers = []
+_idle_workers_lock = threading.Lock()
+
+
+def clean_text(text):
+    """
+    Advanced text cleaning and normalization
+
+    Args:
+        text (str): Raw text to clean
+
+    Returns:
+        str: Cleaned and normalized text
+    """
+    if not text:
+        return ""
+
+    # Remove excessive whitespace
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove very long sequences of special characters
+    text = re.sub(r'[^\w\s.,;:()\-\/]+', '', text)
+
+    # Remove carriage returns
+    text = text.replace('\r', '')
+
+    # Split into lines and remove duplicates while preserving order
+    lines = text.split('\n')
+    seen = set()
+    unique_lines = []
+    for line in lines:
+        line = line.strip()
+        if line and line not in seen:
+            seen.add(line)
+            unique_lines.append(line)
+
+    return '\n'.join(unique_lines)
+
+
+def new_parse_result(file_type: Optional[str]) -> Dict:
+    """
+    Empty parse result
+
+    Keys:
+        text: Cleaned text; None unless status is STATUS_OK, except for
+            partial text after STATUS_TIMEOUT / STATUS_MEMORY_LIMIT
+        status: One of the STATUS_* constants
+        error: Error message for STATUS_ERROR and exceeded budgets
+        file_type: 'pdf', 'docx', 'txt', 'image', 'doc', 'rtf' or None
+        pages: Per-page {'page', 'status', 'chars', 'error'} (PDF only)
+        warnings: Non-fatal problems (e.g. unreadable pages)
+        notices: Informational messages (e.g. encoding fallback)
+        elapsed: Parse time in seconds
+    """
+    return {
+        'text': None,
+        'status': STATUS_OK,
+        'error': None,
+        'file_type': file_type,
+        'pages': [],
+        'warnings': [],
+        'notices': [],
+        'elapsed': 0.0
+    }
+
+
+def _as_stream(source: Union[bytes, io.IOBase]):
+    """Binary stream over raw bytes or a file object (rewound)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _read_bytes(source: Union[bytes, io.IOBase]) -> bytes:
+    """Whole content of raw bytes or a file object"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return _as_stream(source).read()
+
+
+def _extract_page(page, page_num: int) -> Tuple[Dict, str]:
+    """Text of one PDF page plus its page status entry"""
+    page_info = {'page': page_num + 1, 'status': STATUS_OK, 'chars': 0, 'error': None}
+    content = ""
+
+    try:
+        content = page.extract_text() or ""
+        page_info['chars'] = len(content)
+        if not content:
+            page_info['status'] = STATUS_EMPTY
+    except MemoryError:
+        # Running out of memory is a budget problem, not a broken page
+        raise
+    except Exception as e:
+        page_info['status'] = STATUS_ERROR
+        page_info['error'] = str(e)
+
+    return page_info, content
+
+
+# PDF opened once per worker process (see _init_page_worker)
+_worker_pdf_reader = None
+
+
+def _init_page_worker(data: bytes):
+    global _worker_pdf_reader
+    _worker_pdf_reader = PdfReader(io.BytesIO(data))
+
+
+def _extract_page_range(start: int, stop: int) -> List[Tuple[Dict, str]]:
+    """Worker task: extract pages start..stop-1 of the worker's PDF"""
+    pages = _worker_pdf_reader.pages
+    return [_extract_page(pages[page_num], page_num) for page_num in range(start, stop)]
+
+
+def _iter_reader_pages(pdf_reader: PdfReader, data: bytes, n_pages: int,
+                       n_process: Optional[int]) -> Iterator[Tuple[Dict, str]]:
+    """Yield the first n_pages pages of an opened PDF, in order"""
+    if n_process is None:
+        n_process = (os.cpu_count() or 1) if n_pages >= PARALLEL_PAGE_THRESHOLD else 1
+
+    if n_process <= 1 or n_pages <= PAGE_CHUNK_SIZE:
+        for page_num in range(n_pages):
+            yield _extract_page(pdf_reader.pages[page_num], page_num)
+        return
+
+    starts = list(range(0, n_pages, PAGE_CHUNK_SIZE))
+    stops = [min(start + PAGE_CHUNK_SIZE, n_pages) for start in starts]
+
+    # Each worker parses the PDF once; tasks only carry page ranges.
+    # Pending tasks are cancelled if the consumer stops early. Workers are
+    # never forked from the (possibly multi-threaded) caller.
+    executor = ProcessPoolExecutor(
+        max_workers=min(n_process, len(starts)),
+        mp_context=get_process_context(),
+        initializer=_init_page_worker, initargs=(data,)
+    )
+    try:
+        for pages in executor.map(_extract_page_range, starts, stops):
+            yield from pages
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pdf_pages(source: Union[bytes, io.IOBase], max_pages: Optional[int] = None,
+                   n_process: Optional[int] = 1) -> Iterator[Tuple[Dict, str]]:
+    """
+    Lazily extract PDF pages in document order
+
+    Args:
+        source: Raw file bytes or a binary file object (not encrypted)
+        max_pages: Stop after this many pages (None = all)
+        n_process: Worker processes (1 = in process, None = auto: all
+            cores once the PDF has PARALLEL_PAGE_THRESHOLD pages)
+
+    Yields:
+        tuple: (page status entry, page text)
+    """
+    data = _read_bytes(source)
+    pdf_reader = PdfReader(io.BytesIO(data))
+
+    n_pages = len(pdf_reader.pages)
+    if max_pages is not None:
+        n_pages = min(n_pages, max_pages)
+
+    yield from _iter_reader_pages(pdf_reader, data, n_pages, n_process)
+
+
+def _record_page(result: Dict, page_info: Dict):
+    """Add a page status entry (and its warning, if any) to a parse result"""
+    if page_info['error'] is not None:
+        result['warnings'].append(
+            f"Could not extract text from page {page_info['page']}: {page_info['error']}"
+        )
+    result['pages'].append(page_info)
+
+
+def parse_pdf_document(source: Union[bytes, io.IOBase], max_pages: Optional[int] = None,
+                       n_process: Optional[int] = 1,
+                       on_page: Optional[Callable[[Dict, str], None]] = None) -> Dict:
+    """
+    Extract text from a PDF
+
+    Pages are streamed from iter_pdf_pages and joined once at the end.
+
+    Args:
+        source: Raw file bytes or a binary file object
+        max_pages: Stop after this many pages, e.g. for quick screening
+        n_process: Worker processes for page extraction (1 = in process,
+            None = auto, see iter_pdf_pages)
+        on_page: Called with (page status entry, page text) as each page
+            is extracted
+
+    Returns:
+        dict: Parse result (see new_parse_result)
+    """
+    result = new_parse_result('pdf')
+    start = time.perf_counter()
+
+    try:
+        data = _read_bytes(source)
+        pdf_reader = PdfReader(io.BytesIO(data))
+
+        if pdf_reader.is_encrypted:
+            result['status'] = STATUS_ENCRYPTED
+        else:
+            total_pages = len(pdf_reader.pages)
+            n_pages = total_pages if max_pages is None else min(total_pages, max_pages)
+
+            contents = []
+            for page_info, content in _iter_reader_pages(pdf_reader, data, n_pages, n_process):
+                if content:
+                    contents.append(content)
+                _record_page(result, page_info)
+                if on_page is not None:
+                    on_page(page_info, content)
+
+            if n_pages < total_pages:
+                result['notices'].append(f"Only the first {n_pages} of {total_pages} pages were read")
+
+            text = "\n".join(contents)
+            if text.strip():
+                result['text'] = clean_text(text)
+            else:
+                result['status'] = STATUS_EMPTY
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        result['status'] = STATUS_ERROR
+        result['error'] = str(e)
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def iter_docx_blocks(source: Union[bytes, io.IOBase]) -> Iterator[str]:
+    """
+    Stream text blocks out of a DOCX package in document order
+
+    word/document.xml is read straight from the zip with an incremental
+    XML parser. Every element is detached from its parent as soon as it
+    closes, so the tree never holds more than the path of open elements
+    and memory stays flat however long the document (or a table) is. Each paragraph
+    outside a table is one block; each table row is one block of its
+    cell texts joined by spaces. A merged cell is a single element in the
+    XML, so its text appears once. Text boxes are included; deleted
+    revisions and field codes are not.
+
+    Args:
+        source: Raw file bytes or a binary file object
+
+    Yields:
+        str: Non-blank paragraph or table row text
+
+    Raises:
+        KeyError: The package has no word/document.xml
+        ValueError: The part has no document body
+    """
+    with zipfile.ZipFile(_as_stream(source)) as package:
+        with package.open(DOCX_DOCUMENT_PART) as part:
+            has_body = False
+            open_elements = []
+            skip_depth = 0
+            run_depth = 0
+            paragraphs: List[List[str]] = []
+            cells: List[List[str]] = []
+            rows: List[List[str]] = []
+
+            for event, elem in ElementTree.iterparse(part, events=('start', 'end')):
+                tag = elem.tag
+
+                if event == 'start':
+                    open_elements.append(elem)
+                    if skip_depth or tag == _MC_FALLBACK:
+                        # Fallback markup repeats the text of its Choice
+                        skip_depth += 1
+                    elif tag == _W + 'p':
+                        paragraphs.append([])
+                    elif tag == _W + 'r':
+                        run_depth += 1
+                    elif tag == _W + 'tc':
+                        cells.append([])
+                    elif tag == _W + 'tr':
+                        rows.append([])
+                    elif tag == _W + 'body':
+                        has_body = True
+                    continue
+
+                open_elements.pop()
+                if open_elements:
+                    # Earlier siblings are already gone, so this is O(1)
+                    open_elements[-1].remove(elem)
+
+                if skip_depth:
+                    skip_depth -= 1
+
+                elif tag == _W + 't' and paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+
+                elif tag == _W + 'tab' and run_depth and paragraphs:
+                    paragraphs[-1].append("\t")
+
+                elif tag in (_W + 'br', _W + 'cr') and paragraphs:
+                    paragraphs[-1].append("\n")
+
+                elif tag == _W + 'r':
+                    run_depth -= 1
+
+                elif tag == _W + 'p':
+                    text = "".join(paragraphs.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    elif text.strip():
+                        yield text
+
+                elif tag == _W + 'tc':
+                    text = "\n".join(cells.pop())
+                    if text.strip():
+                        rows[-1].append(text)
+
+                elif tag == _W + 'tr':
+                    text = " ".join(rows.pop())
+                    if cells:
+                        # Nested table: its rows belong to the outer cell
+                        cells[-1].append(text)
+                    elif text.strip():
+                        yield text
+
+            if not has_body:
+                raise ValueError(f"{DOCX_DOCUMENT_PART} has no document body")
+
+
+def _python_docx_text(source: Union[bytes, io.IOBase]) -> str:
+    """Paragraph then table text via python-docx (fallback path)"""
+    doc = Document(_as_stream(source))
+    blocks = []
+
+    # Extract from paragraphs
+    for paragraph in doc.paragraphs:
+        if paragraph.text.strip():
+            blocks.append(paragraph.text)
+
+    # Extract from tables (bonus feature)
+    for table in doc.tables:
+        for row in table.rows:
+            blocks.append(" ".join(cell.text for cell in row.cells if cell.text.strip()))
+
+    return "\n".join(blocks)
+
+
+def parse_docx_document(source: Union[bytes, io.IOBase]) -> Dict:
+    """
+    Extract paragraph and table text from a DOCX file
+
+    Uses the streaming reader (iter_docx_blocks); packages it cannot read
+    are handed to python-docx, whose error is reported if that fails too.
+
+    Args:
+        source: Raw file bytes or a binary file object
+
+    Returns:
+        dict: Parse result (see new_parse_result)
+    """
+    result = new_parse_result('docx')
+    start = time.perf_counter()
+
+    try:
+        try:
+            text = "\n".join(iter_docx_blocks(source))
+        except MemoryError:
+            raise
+        except Exception:
+            text = _python_docx_text(source)
+
+        if text.strip():
+            result['text'] = clean_text(text)
+        else:
+            result['status'] = STATUS_EMPTY
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        result['status'] = STATUS_ERROR
+        result['error'] = str(e)
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def parse_txt_document(source: Union[bytes, io.IOBase]) -> Dict:
+    """
+    Decode a text file (UTF-8, falling back to latin-1)
+
+    Args:
+        source: Raw file bytes or a binary file object
+
+    Returns:
+        dict: Parse result (see new_parse_result)
+    """
+    result = new_parse_result('txt')
+    start = time.perf_counter()
+
+    try:
+        data = _as_stream(source).read()
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            text = data.decode('latin-1')
+            result['notices'].append("File decoded using latin-1 encoding")
+        result['text'] = clean_text(text)
+    except MemoryError:
+        raise
+    except Exception as e:
+        result['status'] = STATUS_ERROR
+        result['error'] = str(e)
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def detect_file_type(file_name: str, mime_type: Optional[str] = None) -> Optional[str]:
+    """
+    Classify a document by MIME type and extension
+
+    Args:
+        file_name (str): Original file name
+        mime_type (str): MIME type reported by the upload, if any
+
+    Returns:
+        str: 'pdf', 'docx', 'txt', 'image', 'doc', 'rtf' or None if unknown
+    """
+    file_name = file_name.lower()
+
+    if file_name.endswith(IMAGE_EXTENSIONS):
+        return 'image'
+    if mime_type == PDF_MIME_TYPE or file_name.endswith('.pdf'):
+        return 'pdf'
+    if mime_type == DOCX_MIME_TYPE or file_name.endswith('.docx'):
+        return 'docx'
+    if mime_type == TXT_MIME_TYPE or file_name.endswith('.txt'):
+        return 'txt'
+    if file_name.endswith('.doc'):
+        return 'doc'
+    if file_name.endswith('.rtf'):
+        return 'rtf'
+    return None
+
+
+_PARSERS = {
+    'pdf': parse_pdf_document,
+    'docx': parse_docx_document,
+    'txt': parse_txt_document
+}
+
+
+def parse_document(source: Union[bytes, io.IOBase], file_name: str,
+                   mime_type: Optional[str] = None, max_pages: Optional[int] = None,
+                   n_process: Optional[int] = 1) -> Dict:
+    """
+    Parse a PDF, DOCX or TXT document without any UI side effects
+
+    Args:
+        source: Raw file bytes or a binary file object
+        file_name (str): Original file name (used for type detection)
+        mime_type (str): MIME type reported by the upload, if any
+        max_pages (int): Page limit for PDFs (None = all pages)
+        n_process (int): Worker processes for PDF page extraction (1 = in
+            process, None = auto, see iter_pdf_pages)
+
+    Returns:
+        dict: Parse result (see new_parse_result); unsupported types get
+            STATUS_UNSUPPORTED with file_type telling which kind it was
+    """
+    file_type = detect_file_type(file_name, mime_type)
+    parser = _PARSERS.get(file_type)
+
+    if parser is None:
+        result = new_parse_result(file_type)
+        result['status'] = STATUS_UNSUPPORTED
+        return result
+
+    if file_type == 'pdf':
+        return parse_pdf_document(source, max_pages=max_pages, n_process=n_process)
+
+    return parser(source)
+
+
+def _limit_memory(max_memory_bytes: int):
+    """Cap this process's address space at its current size plus a budget"""
+    if resource is None:
+        return
+
+    current = 0
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = current + max_memory_bytes
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _parse_worker_loop(conn, max_memory_bytes: int):
+    """
+    Worker process: parse documents sent over the pipe under a memory cap
+
+    Each job is (data, file_name, mime_type, max_pages). PDF pages are
+    streamed back as they are extracted, then the result; the worker exits
+    after running out of memory or when the pipe is closed.
+    """
+    _limit_memory(max_memory_bytes)
+    conn.send(('ready', None))
+
+    try:
+        while True:
+            try:
+                data, file_name, mime_type, max_pages = conn.recv()
+            except EOFError:
+                break
+
+            try:
+                if detect_file_type(file_name, mime_type) == 'pdf':
+                    result = parse_pdf_document(
+                        data, max_pages=max_pages, n_process=1,
+                        on_page=lambda page_info, content: conn.send(('page', page_info, content))
+                    )
+                else:
+                    result = parse_document(data, file_name, mime_type)
+                conn.send(('result', result))
+            except MemoryError:
+                conn.send(('memory', None))
+                break
+    finally:
+        conn.close()
+
+
+class _ParseWorker:
+    """
+    A long-lived isolated parse process and its pipe
+
+    Started once and reused for up to PARSE_WORKER_MAX_TASKS documents, so
+    the start-up cost is paid per worker rather than per upload. A worker
+    that times out, runs out of memory or dies is stopped, never reused.
+    """
+
+    def __init__(self, max_memory_bytes: int):
+        context = get_process_context()
+        self.max_memory_bytes = max_memory_bytes
+        self.tasks = 0
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_parse_worker_loop, args=(child_conn, max_memory_bytes), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            ready = self.conn.poll(PARSE_WORKER_START_TIMEOUT) and self.conn.recv()[0] == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.stop()
+            raise RuntimeError(f"Parser process failed to start (exit code {self.process.exitcode})")
+
+    def stop(self):
+        """Terminate the process (killing it if it does not exit)"""
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+def _acquire_worker(max_memory_bytes: int) -> _ParseWorker:
+    """An idle worker with the same memory cap, or a newly started one"""
+    with _idle_workers_lock:
+        for i, worker in enumerate(_idle_workers):
+            if worker.max_memory_bytes == max_memory_bytes:
+                del _idle_workers[i]
+                if worker.process.is_alive():
+                    return worker
+                worker.stop()
+                break
+
+    return _ParseWorker(max_memory_bytes)
+
+
+def _release_worker(worker: _ParseWorker):
+    """Keep a healthy worker for the next document, or retire it"""
+    worker.tasks += 1
+
+    if worker.tasks < PARSE_WORKER_MAX_TASKS and worker.process.is_alive():
+        with _idle_workers_lock:
+            if len(_idle_workers) < PARSE_WORKER_IDLE_MAX:
+                _idle_workers.append(worker)
+                return
+
+    worker.stop()
+
+
+def parse_document_isolated(source: Union[bytes, io.IOBase], file_name: str,
+                            mime_type: Optional[str] = None, max_pages: Optional[int] = None,
+                            timeout: float = PARSE_TIMEOUT_SECONDS,
+                            max_memory_mb: int = PARSE_MEMORY_LIMIT_MB) -> Dict:
+    """
+    Parse a document in a separate process under time and memory budgets
+
+    A malformed PDF can make extraction spin or balloon; here the worker is
+    stopped once a budget is exceeded, so the caller never waits longer
+    than the timeout. PDF pages are streamed back as they are extracted,
+    which lets an interrupted parse still return the text read so far.
+    Pages are extracted sequentially inside the worker: a page pool there
+    would outlive a worker stopped on a budget and escape its memory cap,
+    so parallel extraction is only offered by the in-process parsers.
+
+    Workers are reused between calls (see _ParseWorker). The time budget
+    starts once a worker is ready, so starting a new one is not charged
+    against it.
+
+    Args:
+        source: Raw file bytes or a binary file object
+        file_name (str): Original file name (used for type detection)
+        mime_type (str): MIME type reported by the upload, if any
+        max_pages (int): Page limit for PDFs (None = all pages)
+        timeout (float): Wall-clock budget in seconds
+        max_memory_mb (int): Memory budget of the worker in MB (not
+            enforced on platforms without address-space limits)
+
+    Returns:
+        dict: Parse result (see new_parse_result); STATUS_TIMEOUT or
+            STATUS_MEMORY_LIMIT with any partial text when a budget is hit
+    """
+    start = time.perf_counter()
+    file_type = detect_file_type(file_name, mime_type)
+
+    if file_type not in _PARSERS:
+        return parse_document(source, file_name, mime_type)
+
+    data = _read_bytes(source)
+
+    try:
+        worker = _acquire_worker(max_memory_mb * 1024 * 1024)
+    except (RuntimeError, OSError) as e:
+        result = new_parse_result(file_type)
+        result['status'] = STATUS_ERROR
+        result['error'] = str(e)
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    # The budget covers parsing only, not starting a worker
+    deadline = time.perf_counter() + timeout
+    receiver = worker.conn
+
+    result = None
+    status = None
+    pages = []
+    contents = []
+
+    try:
+        receiver.send((data, file_name, mime_type, max_pages))
+
+        while result is None and status is None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not receiver.poll(remaining):
+                status = STATUS_TIMEOUT
+                break
+
+            message = receiver.recv()
+            if message[0] == 'page':
+                pages.append(message[1])
+                contents.append(message[2])
+            elif message[0] == 'result':
+                result = message[1]
+            else:
+                status = STATUS_MEMORY_LIMIT
+    except (EOFError, OSError):
+        status = STATUS_ERROR
+    finally:
+        if result is not None:
+            _release_worker(worker)
+        else:
+            worker.stop()
+
+    if result is None:
+        result = new_parse_result(file_type)
+        result['status'] = status
+
+        for page_info in pages:
+            _record_page(result, page_info)
+
+        text = "\n".join(content for content in contents if content)
+        if text.strip():
+            result['text'] = clean_text(text)
+
+        if status == STATUS_TIMEOUT:
+            result['error'] = f"Parsing exceeded the {timeout:g} s time budget"
+        elif status == STATUS_MEMORY_LIMIT:
+            result['error'] = f"Parsing exceeded the {max_memory_mb} MB memory budget"
+        else:
+            result['error'] = f"Parser process exited unexpectedly (exit code {worker.process.exitcode})"
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def _get_parse_cache() -> TieredCache:
+    global _parse_cache
+
+    if _parse_cache is None:
+        _parse_cache = TieredCache(
+            max_entries=PARSE_CACHE_SIZE,
+            disk_dir=os.path.join(CACHE_DIR, "parsed_documents"),
+            max_disk_bytes=PARSE_CACHE_DISK_BYTES
+        )
+
+    return _parse_cache
+
+
+def configure_parse_cache(max_entries: int = PARSE_CACHE_SIZE,
+                          disk_dir: Optional[str] = os.path.join(CACHE_DIR, "parsed_documents"),
+                          max_disk_bytes: int = PARSE_CACHE_DISK_BYTES):
+    """
+    Replace the parse cache
+
+    Args:
+        max_entries (int): Parse results kept in memory
+        disk_dir (str): Directory for the on-disk tier (None = memory only)
+        max_disk_bytes (int): Size bound of the on-disk tier
+    """
+    global _parse_cache
+    _parse_cache = TieredCache(max_entries, disk_dir, max_disk_bytes)
+
+
+def get_parse_cache_key(data: bytes, file_type: str, max_pages: Optional[int] = None) -> str:
+    """
+    Cache key of a document: SHA-256 of its bytes plus the parser version
+
+    Args:
+        data (bytes): Raw file content
+        file_type (str): Detected file type
+        max_pages (int): Page limit the document was parsed with
+
+    Returns:
+        str: Hex digest
+    """
+    return content_hash(
+        PARSER_VERSION, file_type, str(max_pages), hashlib.sha256(data).hexdigest()
+    )
+
+
+def parse_document_cached(source: Union[bytes, io.IOBase], file_name: str,
+                          mime_type: Optional[str] = None, max_pages: Optional[int] = None,
+                          isolated: bool = True, n_process: Optional[int] = 1) -> Dict:
+    """
+    Parse a document, reusing the result of an earlier parse of the same bytes
+
+    Results are keyed by content (not file name), so re-uploading a file,
+    even renamed, skips PDF/DOCX decoding. Only CACHEABLE_STATUSES are stored.
+
+    Args:
+        source: Raw file bytes or a binary file object
+        file_name (str): Original file name (used for type detection)
+        mime_type (str): MIME type reported by the upload, if any
+        max_pages (int): Page limit for PDFs (None = all pages)
+        isolated (bool): Parse misses with parse_document_isolated (True)
+            or in process with parse_document (False)
+        n_process (int): Worker processes for PDF page extraction when not
+            isolated (1 = in process, None = auto); isolated parses always
+            extract pages sequentially
+
+    Returns:
+        dict: Parse result (see new_parse_result); elapsed is the lookup
+            time on a cache hit
+    """
+    start = time.perf_counter()
+    file_type = detect_file_type(file_name, mime_type)
+
+    if file_type not in _PARSERS:
+        return parse_document(source, file_name, mime_type)
+
+    data = _read_bytes(source)
+    key = get_parse_cache_key(data, file_type, max_pages)
+    cache = _get_parse_cache()
+
+    cached = cache.get(key)
+    if cached is not None:
+        result = copy.deepcopy(cached)
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    if isolated:
+        result = parse_document_isolated(data, file_name, mime_type, max_pages=max_pages)
+    else:
+        result = parse_document(data, file_name, mime_type, max_pages=max_pages, n_process=n_process)
+
+    if result['status'] in CACHEABLE_STATUSES:
+        cache.put(key, copy.deepcopy(result))
+
+    return result
\ No newline at end of file
@@ -4,45 +4,124 @@ Combines robust parsing with advanced validation
 Features from both implementations
 """
 
-import io
 import re
-from PyPDF2 import PdfReader
-from docx import Document
 import streamlit as st
+from utils.document_parser import (
+    STATUS_EMPTY, STATUS_ENCRYPTED, STATUS_ERROR, STATUS_MEMORY_LIMIT, STATUS_OK,
+    STATUS_TIMEOUT, STATUS_UNSUPPORTED, clean_text, parse_document_cached,
+    parse_docx_document, parse_pdf_document, parse_txt_document
+)
 
-def clean_text(text):
+# Parsing itself lives in utils.document_parser (no Streamlit calls); the
+# functions below only display its results and keep the old signatures
+
+def _show_failure(result, file_name=None):
     """
-    Advanced text cleaning and normalization
+    Display why a document produced no (or only partial) text
     
     Args:
-        text (str): Raw text to clean
+        result (dict): Parse result from utils.document_parser
+        file_name (str): Lowercased file name, for unsupported formats
+    """
+    status = result['status']
+    file_type = result['file_type']
+    
+    if status in (STATUS_TIMEOUT, STATUS_MEMORY_LIMIT):
+        reason = (
+            "⏱️ **Parsing this document took too long and was stopped.**"
+            if status == STATUS_TIMEOUT else
+            "💾 **Parsing this document needed too much memory and was stopped.**"
+        )
+        if result['text']:
+            st.warning(f"{reason}\n\nOnly part of the text could be extracted; please review it below.")
+        else:
+            st.error(f"{reason}\n\nThe file may be malformed. Please try another file or paste the text manually.")
     
-    Returns:
-        str: Cleaned and normalized text
+    elif status == STATUS_ENCRYPTED:
+        st.error(
+            "🔒 **This PDF is encrypted or password-protected.**\n\n"
+            "Unable to extract text. Please provide an unprotected version."
+        )
+    
+    elif status == STATUS_EMPTY and file_type == 'pdf':
+        st.warning(
+            "📄 **No text content found in PDF.**\n\n"
+            "This might be a scanned document. Please use a searchable PDF or paste text manually."
+        )
+    
+    elif status == STATUS_EMPTY:
+        st.warning("📄 **No text content found in DOCX file.**")
+    
+    elif status == STATUS_ERROR and file_type == 'pdf':
+        st.error(f"❌ **Error reading PDF:** {result['error']}")
+    
+    elif status == STATUS_ERROR and file_type == 'docx':
+        st.error(
+            f"❌ **Unable to read DOCX file.**\n\n"
+            f"Error: {result['error']}\n\n"
+            "The file may be corrupted, encrypted, or in an unsupported format."
+        )
+    
+    elif status == STATUS_ERROR:
+        st.error(f"❌ **Error reading TXT file:** {result['error']}")
+    
+    elif status == STATUS_UNSUPPORTED and file_type == 'image':
+        st.error(
+            "🖼️ **Image files are not supported for text parsing.**\n\n"
+            "📄 Please upload a text-based document:\n"
+            "- PDF (searchable, not scanned)\n"
+            "- DOCX (Microsoft Word)\n"
+            "- TXT (Plain text)\n\n"
+            "💡 **Tip:** If you have a scanned document, consider using OCR software first."
+        )
+    
+    elif status == STATUS_UNSUPPORTED and file_type == 'doc':
+        st.error(
+            "⚠️ **Legacy .DOC format is not supported.**\n\n"
+            "Please convert to .DOCX format using Microsoft Word or Google Docs."
+        )
+    
+    elif status == STATUS_UNSUPPORTED and file_type == 'rtf':
+        st.error(
+            "⚠️ **RTF format is not supported.**\n\n"
+            "Please convert to PDF or DOCX format."
+        )
+    
+    elif status == STATUS_UNSUPPORTED:
+        st.error(
+            f"❌ **Unsupported file format: `{file_name}`**\n\n"
+            "**Supported formats:**\n"
+            "- PDF (.pdf)\n"
+            "- Word Document (.docx)\n"
+            "- Plain Text (.txt)\n\n"
+            "**Not supported:**\n"
+            "- Images (.jpg, .png, etc.)\n"
+            "- Legacy Word (.doc)\n"
+            "- Rich Text (.rtf)\n"
+            "- Scanned PDFs"
+        )
+
+def show_parse_result(result, file_name=None):
     """
-    if not text:
-        return ""
+    Display a parse result in Streamlit and return its text
     
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    Args:
+        result (dict): Parse result from utils.document_parser
+        file_name (str): Lowercased file name, for unsupported formats
     
-    # Remove very long sequences of special characters
-    text = re.sub(r'[^\w\s.,;:()\-\/]+', '', text)
+    Returns:
+        str: Extracted text (possibly partial) or None if parsing failed
+    """
+    for warning in result['warnings']:
+        st.warning(f"⚠️ {warning}")
     
-    # Remove carriage returns
-    text = text.replace('\r', '')
+    for notice in result['notices']:
+        st.info(f"ℹ️ {notice}")
     
-    # Split into lines and remove duplicates while preserving order
-    lines = text.split('\n')
-    seen = set()
-    unique_lines = []
-    for line in lines:
-        line = line.strip()
-        if line and line not in seen:
-            seen.add(line)
-            unique_lines.append(line)
+    if result['status'] != STATUS_OK:
+        _show_failure(result, file_name)
     
-    return '\n'.join(unique_lines)
+    return result['text']
 
 def parse_pdf(file):
     """
@@ -54,39 +133,7 @@ def parse_pdf(file):
     Returns:
         str: Extracted text or None if failed
     """
-    try:
-        pdf_reader = PdfReader(file)
-        
-        # Check if PDF is encrypted (from your implementation)
-        if pdf_reader.is_encrypted:
-            st.error(
-                "🔒 **This PDF is encrypted or password-protected.**\n\n"
-                "Unable to extract text. Please provide an unprotected version."
-            )
-            return None
-        
-        text = ""
-        for page_num, page in enumerate(pdf_reader.pages):
-            try:
-                content = page.extract_text()
-                if content:
-                    text += content + "\n"
-            except Exception as e:
-                st.warning(f"⚠️ Could not extract text from page {page_num + 1}: {str(e)}")
-                continue
-        
-        if not text.strip():
-            st.warning(
-                "📄 **No text content found in PDF.**\n\n"
-                "This might be a scanned document. Please use a searchable PDF or paste text manually."
-            )
-            return None
-        
-        return clean_text(text)
-        
-    except Exception as e:
-        st.error(f"❌ **Error reading PDF:** {str(e)}")
-        return None
+    return show_parse_result(parse_pdf_document(file))
 
 def parse_docx(file):
     """
@@ -98,36 +145,7 @@ def parse_docx(file):
     Returns:
         str: Extracted text or None if failed
     """
-    try:
-        doc = Document(file)
-        text = ""
-        
-        # Extract from paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text += paragraph.text + "\n"
-        
-        # Extract from tables (bonus feature)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text += cell.text + " "
-                text += "\n"
-        
-        if not text.strip():
-            st.warning("📄 **No text content found in DOCX file.**")
-            return None
-        
-        return clean_text(text)
-        
-    except Exception as e:
-        st.error(
-            f"❌ **Unable to read DOCX file.**\n\n"
-            f"Error: {str(e)}\n\n"
-            "The file may be corrupted, encrypted, or in an unsupported format."
-        )
-        return None
+    return show_parse_result(parse_docx_document(file))
 
 def parse_txt(file):
     """
@@ -139,23 +157,7 @@ def parse_txt(file):
     Returns:
         str: Extracted text or None if failed
     """
-    try:
-        # Try UTF-8 first
-        text = file.read().decode('utf-8')
-        return clean_text(text)
-    except UnicodeDecodeError:
-        # Fallback to latin-1
-        try:
-            file.seek(0)
-            text = file.read().decode('latin-1')
-            st.info("ℹ️ File decoded using latin-1 encoding")
-            return clean_text(text)
-        except Exception as e:
-            st.error(f"❌ **Unable to decode text file:** {str(e)}")
-            return None
-    except Exception as e:
-        st.error(f"❌ **Error reading TXT file:** {str(e)}")
-        return None
+    return show_parse_result(parse_txt_document(file))
 
 def parse_file(file):
     """
@@ -171,73 +173,11 @@ def parse_file(file):
     if file is None:
         return None
     
-    file_name = file.name.lower()
-    file_type = file.type
-    
-    # ===================================
-    # IMAGE FILE DETECTION (From your code)
-    # ===================================
-    if file_name.endswith(('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tiff')):
-        st.error(
-            "🖼️ **Image files are not supported for text parsing.**\n\n"
-            "📄 Please upload a text-based document:\n"
-            "- PDF (searchable, not scanned)\n"
-            "- DOCX (Microsoft Word)\n"
-            "- TXT (Plain text)\n\n"
-            "💡 **Tip:** If you have a scanned document, consider using OCR software first."
-        )
-        return None
-    
-    # Reset file pointer
-    file.seek(0)
-    
-    # ===================================
-    # FILE TYPE DETECTION & PARSING
-    # ===================================
-    
-    # PDF Files
-    if file_type == "application/pdf" or file_name.endswith('.pdf'):
-        return parse_pdf(file)
-    
-    # DOCX Files
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or file_name.endswith('.docx'):
-        return parse_docx(file)
-    
-    # TXT Files
-    elif file_type == "text/plain" or file_name.endswith('.txt'):
-        return parse_txt(file)
-    
-    # DOC Files (Old Word format - not supported)
-    elif file_name.endswith('.doc'):
-        st.error(
-            "⚠️ **Legacy .DOC format is not supported.**\n\n"
-            "Please convert to .DOCX format using Microsoft Word or Google Docs."
-        )
-        return None
-    
-    # RTF Files
-    elif file_name.endswith('.rtf'):
-        st.error(
-            "⚠️ **RTF format is not supported.**\n\n"
-            "Please convert to PDF or DOCX format."
-        )
-        return None
-    
-    # Unsupported Format
-    else:
-        st.error(
-            f"❌ **Unsupported file format: `{file_name}`**\n\n"
-            "**Supported formats:**\n"
-            "- PDF (.pdf)\n"
-            "- Word Document (.docx)\n"
-            "- Plain Text (.txt)\n\n"
-            "**Not supported:**\n"
-            "- Images (.jpg, .png, etc.)\n"
-            "- Legacy Word (.doc)\n"
-            "- Rich Text (.rtf)\n"
-            "- Scanned PDFs"
-        )
-        return None
+    # Repeat uploads of the same bytes are served from the parse cache;
+    # misses are parsed in a separate process under time and memory
+    # budgets, so a pathological file cannot stall the session
+    result = parse_document_cached(file, file.name, file.type)
+    return show_parse_result(result, file.name.lower())
 
 def validate_file_size(file, max_size_mb=10):
     """
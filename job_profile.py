@@ -0,0 +1,230 @@
+"""
+Compiled Job Profiles
+A job description analysed once: extracted skills, interned skill IDs,
+bitsets and priority weights, persisted by content hash so every later
+comparison against the JD skips extraction and JD preprocessing
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.cache_store import TieredCache, content_hash
+from utils.comparator import get_missing_priority
+from utils.skill_bitset import ProfileBitset
+from utils.skill_extractor import (
+    EXTRACTION_MODES, EXTRACTOR_VERSION, extract_skills_with_confidence,
+    get_skill_registry, get_taxonomy_index
+)
+from utils.skill_frequency import get_frequency_model
+from utils.taxonomy_index import CACHE_DIR
+
+# Bump whenever the persisted JobProfile layout changes
+JOB_PROFILE_VERSION = 1
+
+# In-memory profiles kept compiled; the disk tier holds the rest
+JOB_PROFILE_CACHE_SIZE = 1024
+
+_job_profile_store = None
+
+
+class JobProfile:
+    """
+    A JD compiled for repeated comparisons
+
+    Only profile_id and skills are persisted. Everything derived from the
+    skill registry is rebuilt when a profile is loaded, because IDs of
+    skills outside the taxonomy are assigned per process.
+
+    Attributes:
+        profile_id: Content hash identifying the profile
+        skills: {category: {skill: confidence}} as extracted
+        flat: {skill_id: {'category', 'confidence'}}
+        skill_ids: Interned skill IDs (int64 array, flat order)
+        confidences: JD confidence of each skill (int64 array)
+        bitset: ProfileBitset of the JD
+    """
+
+    def __init__(self, profile_id: str, skills: Dict[str, Dict[str, int]]):
+        self.profile_id = profile_id
+        self.skills = skills
+        self._compile()
+
+    def _compile(self):
+        registry = get_skill_registry()
+
+        self.flat: Dict[int, Dict] = {}
+        for category, category_skills in self.skills.items():
+            for skill, conf in category_skills.items():
+                self.flat[registry.intern(skill)] = {
+                    'category': category,
+                    'confidence': conf
+                }
+
+        self.skill_ids = np.fromiter(self.flat.keys(), dtype=np.int64, count=len(self.flat))
+        self.confidences = np.fromiter(
+            (data['confidence'] for data in self.flat.values()), dtype=np.int64, count=len(self.flat)
+        )
+        self.bitset = ProfileBitset(self.skills, registry)
+
+        # (frequency model, its JD count, priorities) of the last computation
+        self._priority_cache = None
+
+    @property
+    def priorities(self) -> Dict[int, str]:
+        """
+        Missing-skill priority of each skill ID ('Critical', 'High', 'Medium')
+
+        Priorities depend on corpus demand, so they are recomputed whenever
+        the frequency model has recorded new JDs since the last call.
+        """
+        frequency_model = get_frequency_model()
+        cache = self._priority_cache
+        if cache is not None and cache[0] is frequency_model and cache[1] == frequency_model.n_docs:
+            return cache[2]
+
+        registry = get_skill_registry()
+        n_docs = frequency_model.n_docs
+        priorities = {
+            skill_id: get_missing_priority(conf, registry.canonical(skill_id))
+            for skill_id, conf in zip(self.skill_ids.tolist(), self.confidences.tolist())
+        }
+        self._priority_cache = (frequency_model, n_docs, priorities)
+        return priorities
+
+    def __len__(self) -> int:
+        return len(self.flat)
+
+    def __getstate__(self):
+        return {
+            'version': JOB_PROFILE_VERSION,
+            'profile_id': self.profile_id,
+            'skills': self.skills
+        }
+
+    def __setstate__(self, state):
+        self.profile_id = state['profile_id']
+        self.skills = state['skills']
+        self._compile()
+
+    @classmethod
+    def from_skills(cls, skills: Dict[str, Dict[str, int]]) -> 'JobProfile':
+        """
+        Compile an already extracted JD skill profile
+
+        Args:
+            skills: {category: {skill: confidence}}
+
+        Returns:
+            JobProfile: Profile whose ID is the hash of the skills
+        """
+        profile_id = content_hash(
+            str(JOB_PROFILE_VERSION), json.dumps(skills, sort_keys=True, ensure_ascii=False)
+        )
+        return cls(profile_id, skills)
+
+
+def _get_store() -> TieredCache:
+    global _job_profile_store
+
+    if _job_profile_store is None:
+        _job_profile_store = TieredCache(
+            max_entries=JOB_PROFILE_CACHE_SIZE,
+            disk_dir=os.path.join(CACHE_DIR, "job_profiles")
+        )
+
+    return _job_profile_store
+
+
+def configure_job_profile_store(max_entries: int = JOB_PROFILE_CACHE_SIZE,
+                                disk_dir: Optional[str] = os.path.join(CACHE_DIR, "job_profiles"),
+                                max_disk_bytes: int = 256 * 1024 * 1024):
+    """
+    Replace the job profile store
+
+    Args:
+        max_entries (int): Compiled profiles kept in memory
+        disk_dir (str): Directory for persisted profiles (None = memory only)
+        max_disk_bytes (int): Size bound of the on-disk tier
+    """
+    global _job_profile_store
+    _job_profile_store = TieredCache(max_entries, disk_dir, max_disk_bytes)
+
+
+def get_job_profile_id(jd_text: str, mode: str = "accurate") -> str:
+    """
+    Content hash of a JD text under the current extractor and taxonomy
+
+    Args:
+        jd_text (str): Job description text
+        mode (str): Extraction mode
+
+    Returns:
+        str: Profile ID
+    """
+    return content_hash(
+        str(JOB_PROFILE_VERSION), EXTRACTOR_VERSION, mode,
+        get_taxonomy_index().taxonomy_hash, jd_text.lower()
+    )
+
+
+def register_job_profile(jd_text: str, mode: str = "accurate") -> JobProfile:
+    """
+    Analyse a JD once and persist the compiled profile
+
+    Registering the same text again returns the stored profile. Newly
+    seen JDs are also added to the corpus skill frequency model.
+
+    Args:
+        jd_text (str): Job description text
+        mode (str): Extraction mode ("accurate" or "fast")
+
+    Returns:
+        JobProfile: Compiled profile (profile_id can be passed to load_job_profile)
+    """
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode!r} (expected one of {EXTRACTION_MODES})")
+
+    profile_id = get_job_profile_id(jd_text, mode)
+    store = _get_store()
+
+    profile = store.get(profile_id)
+    if profile is None:
+        skills = extract_skills_with_confidence(jd_text, mode=mode)
+        get_frequency_model().add_document(
+            content_hash(jd_text.lower()),
+            (skill for category_skills in skills.values() for skill in category_skills)
+        )
+        profile = JobProfile(profile_id, skills)
+        store.put(profile_id, profile)
+
+    return profile
+
+
+def save_job_profile(profile: JobProfile) -> str:
+    """
+    Persist a compiled profile (e.g. one built with JobProfile.from_skills)
+
+    Args:
+        profile (JobProfile): Profile to store
+
+    Returns:
+        str: Its profile ID
+    """
+    _get_store().put(profile.profile_id, profile)
+    return profile.profile_id
+
+
+def load_job_profile(profile_id: str) -> Optional[JobProfile]:
+    """
+    Load a registered profile by ID
+
+    Args:
+        profile_id (str): ID returned by register_job_profile
+
+    Returns:
+        JobProfile or None if the profile is unknown (or was evicted)
+    """
+    return _get_store().get(profile_id)
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Worker Process Context
+The one multiprocessing context every worker pool and isolated worker uses,
+so no pool is ever forked from the multi-threaded Streamlit server
+"""
+
+import multiprocessing
+
+# Modules imported once in the forkserver, so workers start with them loaded
+WORKER_PRELOAD = ['utils.skill_extractor', 'utils.document_parser']
+
+
+def get_process_context():
+    """
+    Process context for worker pools and isolated workers
+
+    forkserver (POSIX) avoids forking the multi-threaded Streamlit process
+    and preloads WORKER_PRELOAD; spawn is the portable fallback. Either way
+    a new process first re-imports the parent's __main__ module (under
+    `streamlit run`, the Streamlit launcher), so starting one is not cheap.
+
+    Returns:
+        BaseContext: forkserver or spawn context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(WORKER_PRELOAD)
+        return context
+    return multiprocessing.get_context('spawn')
\ No newline at end of file
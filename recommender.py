@@ -5,6 +5,7 @@ Features from both implementations
 """
 
 from typing import Dict, List
+from utils.skill_extractor import get_skill_registry
 
 # Comprehensive Course Database (100+ mapped skills)
 COURSE_DATABASE = {
@@ -168,6 +169,24 @@ COURSE_DATABASE = {
     }
 }
 
+# COURSE_DATABASE re-keyed by interned skill ID (built on first use)
+_courses_by_id = None
+
+def _get_courses_by_id() -> Dict[int, Dict]:
+    """
+    Index COURSE_DATABASE by shared skill ID so lookups skip string handling
+    
+    Returns:
+        dict: {skill_id: course entry}
+    """
+    global _courses_by_id
+    
+    if _courses_by_id is None:
+        registry = get_skill_registry()
+        _courses_by_id = {registry.intern(skill): data for skill, data in COURSE_DATABASE.items()}
+    
+    return _courses_by_id
+
 def get_smart_recommendations(comparison: Dict) -> Dict:
     """
     Generate smart, prioritized recommendations
@@ -180,17 +199,21 @@ def get_smart_recommendations(comparison: Dict) -> Dict:
         dict: {skill: {priority, action, courses}}
     """
     recommendations = {}
+    registry = get_skill_registry()
+    courses_by_id = _get_courses_by_id()
     
     missing_with_priority = comparison.get('missing_with_priority', [])
     
     for item in missing_with_priority:
         skill = item['skill']
         priority = item['priority']
-        skill_lower = skill.lower()
+        skill_id = item.get('skill_id')
+        if skill_id is None:
+            skill_id = registry.get_id(skill)
         
         # Get courses for this skill
-        if skill_lower in COURSE_DATABASE:
-            skill_data = COURSE_DATABASE[skill_lower]
+        if skill_id in courses_by_id:
+            skill_data = courses_by_id[skill_id]
             courses = skill_data['courses']
             action = skill_data['priority_map'].get(priority, "Focus on learning this skill")
         else:
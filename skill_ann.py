@@ -0,0 +1,216 @@
+"""
+Fuzzy Skill Index
+Character n-gram hashing vectors plus a random-projection LSH index, so
+spelling variants ("Postgres" / "PostgreSQL") and free-form skills outside
+the taxonomy can be matched without scanning every known skill
+"""
+
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from utils.skill_registry import SkillRegistry
+
+# Character n-grams within word boundaries; (3, 4) keeps "Java" and
+# "JavaScript" below the partial threshold while "Postgres" stays close
+# to "PostgreSQL"
+NGRAM_RANGE = (3, 4)
+HASH_FEATURES = 2 ** 13
+
+# LSH layout: each table hashes a vector to LSH_BITS hyperplane signs.
+# Buckets one bit away are probed too, which keeps recall high for
+# similarities around the partial-match threshold
+LSH_TABLES = 16
+LSH_BITS = 10
+LSH_SEED = 0
+
+_char_vectorizer = None
+
+
+def get_char_vectorizer() -> HashingVectorizer:
+    """
+    Stateless character n-gram vectorizer (no fitting, same output in
+    every process)
+
+    Returns:
+        HashingVectorizer: L2-normalized, non-negative feature hashing
+    """
+    global _char_vectorizer
+
+    if _char_vectorizer is None:
+        _char_vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=NGRAM_RANGE, n_features=HASH_FEATURES,
+            alternate_sign=False, norm='l2', lowercase=True, dtype=np.float32
+        )
+
+    return _char_vectorizer
+
+
+def char_ngram_vectors(skills: Iterable[str]) -> sparse.csr_matrix:
+    """
+    Character n-gram vectors of skill names
+
+    Args:
+        skills: Skill names
+
+    Returns:
+        csr_matrix: (n_skills, HASH_FEATURES) unit-length rows
+    """
+    return get_char_vectorizer().transform(list(skills))
+
+
+class FuzzySkillIndex:
+    """
+    Approximate nearest-neighbour index over skill names
+
+    Skills are keyed by registry ID. Each of n_tables tables buckets skills
+    by the signs of n_bits random projections of their character n-gram
+    vectors; a query only scores the skills sharing a bucket (or a bucket
+    one bit away) in some table, then ranks them by exact cosine.
+
+    Vectors are kept in row segments. Adding skills appends a segment and
+    merges equal-sized neighbours (like a binary counter), so the number of
+    segments stays logarithmic and each vector is copied O(log n) times
+    overall instead of on every add.
+    """
+
+    def __init__(self, registry: SkillRegistry, n_tables: int = LSH_TABLES,
+                 n_bits: int = LSH_BITS, seed: int = LSH_SEED):
+        self.registry = registry
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((HASH_FEATURES, n_tables * n_bits)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(n_bits)).astype(np.int64)
+        self._probe_masks = [0] + [1 << bit for bit in range(n_bits)]
+
+        # Buckets hold global row numbers; _segments[i] holds rows from
+        # _segment_starts[i] on, and _skill_ids maps rows back to registry IDs
+        self._tables: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(n_tables)]
+        self._segments: List[sparse.csr_matrix] = []
+        self._segment_starts: List[int] = []
+        self._skill_ids: List[int] = []
+        self._row_of: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, skill_id: int) -> bool:
+        return skill_id in self._row_of
+
+    def _signatures(self, vectors: sparse.csr_matrix) -> np.ndarray:
+        """Bucket key of every row in every table, shape (n_rows, n_tables)"""
+        signs = np.asarray(vectors @ self._planes) > 0
+        signs = signs.reshape(vectors.shape[0], self.n_tables, self.n_bits)
+        return signs @ self._bit_weights
+
+    def add_many(self, skills: Iterable[str]) -> List[int]:
+        """
+        Register skills (taxonomy or user-added) in the index
+
+        Args:
+            skills: Skill names in any case
+
+        Returns:
+            list: Registry IDs of the skills, in input order
+        """
+        skill_ids = [self.registry.intern(skill) for skill in skills]
+
+        with self._lock:
+            new_ids = list(dict.fromkeys(i for i in skill_ids if i not in self._row_of))
+            if not new_ids:
+                return skill_ids
+
+            vectors = char_ngram_vectors(self.registry.canonical(i) for i in new_ids)
+            signatures = self._signatures(vectors)
+
+            first_row = len(self._row_of)
+            for offset, skill_id in enumerate(new_ids):
+                row = first_row + offset
+                self._row_of[skill_id] = row
+                for table, key in zip(self._tables, signatures[offset].tolist()):
+                    table[key].append(row)
+
+            self._skill_ids.extend(new_ids)
+            self._append_segment(vectors, first_row)
+
+        return skill_ids
+
+    def _append_segment(self, vectors: sparse.csr_matrix, first_row: int):
+        """Append a row segment, merging trailing segments no larger than it"""
+        while self._segments and self._segments[-1].shape[0] <= vectors.shape[0]:
+            vectors = sparse.vstack([self._segments.pop(), vectors], format='csr')
+            first_row = self._segment_starts.pop()
+
+        self._segments.append(vectors)
+        self._segment_starts.append(first_row)
+
+    def _rows(self, rows: np.ndarray) -> sparse.csr_matrix:
+        """Vectors of sorted global rows, gathered across segments"""
+        parts = []
+        for segment, start in zip(self._segments, self._segment_starts):
+            lo, hi = np.searchsorted(rows, [start, start + segment.shape[0]])
+            if lo < hi:
+                parts.append(segment[rows[lo:hi] - start])
+        return sparse.vstack(parts, format='csr')
+
+    def _row_vector(self, row: int) -> sparse.csr_matrix:
+        segment = bisect_right(self._segment_starts, row) - 1
+        return self._segments[segment][row - self._segment_starts[segment]]
+
+    def add(self, skill: str) -> int:
+        """Register one skill, returning its registry ID"""
+        return self.add_many([skill])[0]
+
+    def query(self, skill: str, k: int = 5,
+              min_similarity: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Approximate nearest known skills to a skill name
+
+        The query itself is neither interned nor added to the index.
+
+        Args:
+            skill: Skill name (need not be registered)
+            k: Maximum number of neighbours
+            min_similarity: Drop neighbours below this cosine similarity
+
+        Returns:
+            list: (skill_id, similarity) pairs, most similar first
+        """
+        vector = char_ngram_vectors([skill])
+        signature = self._signatures(vector)[0].tolist()
+
+        with self._lock:
+            buckets = [
+                bucket
+                for table, key in zip(self._tables, signature)
+                for mask in self._probe_masks
+                for bucket in (table.get(key ^ mask),)
+                if bucket
+            ]
+            if not buckets:
+                return []
+
+            rows = np.unique(np.concatenate(buckets))
+            candidate_vectors = self._rows(rows)
+            candidate_ids = [self._skill_ids[row] for row in rows.tolist()]
+
+        similarities = (candidate_vectors @ vector.T).toarray().ravel()
+
+        keep = np.flatnonzero(similarities >= min_similarity)
+        order = keep[np.argsort(-similarities[keep], kind='stable')[:k]]
+        return [(candidate_ids[i], float(similarities[i])) for i in order.tolist()]
+
+    def similarity(self, skill_a: int, skill_b: int) -> float:
+        """Exact character n-gram cosine between two indexed skill IDs"""
+        with self._lock:
+            vector_a = self._row_vector(self._row_of[skill_a])
+            vector_b = self._row_vector(self._row_of[skill_b])
+        return float(vector_a.multiply(vector_b).sum())
\ No newline at end of file
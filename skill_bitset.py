@@ -0,0 +1,224 @@
+"""
+Packed Skill Bitsets
+Encodes skill profiles as packed uint64 bitsets over interned skill IDs, so
+exact matched/missing/extra counts come from bitwise AND/ANDNOT and popcount
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from utils.skill_registry import SkillRegistry
+
+WORD_BITS = 64
+
+# Set-bit count of every byte value, for NumPy builds without bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def bitset_words(n_bits: int) -> int:
+    """Number of uint64 words needed to hold n_bits"""
+    return max(1, -(-n_bits // WORD_BITS))
+
+
+def to_bitset(skill_ids: Iterable[int], n_bits: int) -> np.ndarray:
+    """
+    Pack skill IDs into a bitset
+
+    Args:
+        skill_ids: Interned skill IDs (all below n_bits)
+        n_bits: Bitset width, usually len(registry)
+
+    Returns:
+        np.ndarray: uint64 words, bit i set when skill ID i is present
+    """
+    ids = np.fromiter(skill_ids, dtype=np.int64)
+    bits = np.zeros(bitset_words(n_bits), dtype=np.uint64)
+    np.bitwise_or.at(bits, ids >> 6, np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+    return bits
+
+
+def from_bitset(bits: np.ndarray) -> np.ndarray:
+    """
+    Unpack a bitset into the skill IDs it contains
+
+    Args:
+        bits: uint64 words
+
+    Returns:
+        np.ndarray: Sorted skill IDs
+    """
+    flags = np.unpackbits(np.ascontiguousarray(bits, dtype='<u8').view(np.uint8), bitorder='little')
+    return np.flatnonzero(flags)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits along the last axis
+
+    Args:
+        bits: uint64 words, shape (..., words)
+
+    Returns:
+        np.ndarray: Set-bit counts, shape (...)
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+    as_bytes = np.ascontiguousarray(bits).view(np.uint8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def _pad(bits: np.ndarray, n_words: int) -> np.ndarray:
+    """Zero-extend bitsets (last axis) to n_words"""
+    missing = n_words - bits.shape[-1]
+    if missing <= 0:
+        return bits
+    padding = [(0, 0)] * (bits.ndim - 1) + [(0, missing)]
+    return np.pad(bits, padding)
+
+
+def _aligned(a: np.ndarray, b: np.ndarray):
+    """Pad two bitsets to a common width (the registry may have grown)"""
+    n_words = max(a.shape[-1], b.shape[-1])
+    return _pad(a, n_words), _pad(b, n_words)
+
+
+def overlap_bitsets(resume_bits: np.ndarray, jd_bits: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Exact matched/missing/extra bitsets of a resume against a JD
+
+    Args:
+        resume_bits: Resume bitset
+        jd_bits: JD bitset
+
+    Returns:
+        dict: {'matched': resume AND jd, 'missing': jd ANDNOT resume,
+            'extra': resume ANDNOT jd}
+    """
+    resume_bits, jd_bits = _aligned(resume_bits, jd_bits)
+    return {
+        'matched': resume_bits & jd_bits,
+        'missing': jd_bits & ~resume_bits,
+        'extra': resume_bits & ~jd_bits
+    }
+
+
+def overlap_counts(resume_bits: np.ndarray, jd_bits: np.ndarray) -> Dict[str, int]:
+    """
+    Exact matched/missing/extra counts of a resume against a JD
+
+    Args:
+        resume_bits: Resume bitset
+        jd_bits: JD bitset
+
+    Returns:
+        dict: {'matched': int, 'missing': int, 'extra': int}
+    """
+    return {name: int(popcount(bits)) for name, bits in overlap_bitsets(resume_bits, jd_bits).items()}
+
+
+class ProfileBitset:
+    """
+    Bitset view of a categorized skill profile
+
+    Attributes:
+        n_bits: Width the profile was encoded with
+        overall: Bitset of every skill in the profile
+        categories: {category: bitset of the skills listed under it}
+    """
+
+    def __init__(self, skills_dict: Dict[str, Dict[str, int]], registry: SkillRegistry,
+                 n_bits: Optional[int] = None):
+        category_ids = {
+            category: [registry.intern(skill) for skill in skills]
+            for category, skills in skills_dict.items()
+        }
+
+        self.n_bits = len(registry) if n_bits is None else n_bits
+        self.categories: Dict[str, np.ndarray] = {
+            category: to_bitset(ids, self.n_bits) for category, ids in category_ids.items()
+        }
+
+        self.overall = np.zeros(bitset_words(self.n_bits), dtype=np.uint64)
+        for bits in self.categories.values():
+            self.overall |= bits
+
+    def category(self, category: str) -> np.ndarray:
+        """Bitset of a category, empty if the profile does not list it"""
+        bits = self.categories.get(category)
+        if bits is None:
+            bits = np.zeros_like(self.overall)
+        return bits
+
+    def compare(self, jd: 'ProfileBitset') -> Dict:
+        """
+        Exact overlap counts against a JD, overall and per category
+
+        Args:
+            jd: JD profile bitset
+
+        Returns:
+            dict: {'overall': counts, 'categories': {category: counts}}
+                where counts is {'matched', 'missing', 'extra'}
+        """
+        categories = list(self.categories) + [c for c in jd.categories if c not in self.categories]
+        return {
+            'overall': overlap_counts(self.overall, jd.overall),
+            'categories': {
+                category: overlap_counts(self.category(category), jd.category(category))
+                for category in categories
+            }
+        }
+
+
+def encode_profiles(profiles: Iterable[Sequence[int]], n_bits: int) -> np.ndarray:
+    """
+    Pack many profiles (as skill ID lists) into one bitset matrix
+
+    Args:
+        profiles: Skill ID sequences, one per profile
+        n_bits: Bitset width shared by every row
+
+    Returns:
+        np.ndarray: uint64 matrix of shape (n_profiles, words)
+    """
+    rows: List[np.ndarray] = []
+    ids: List[np.ndarray] = []
+    n_profiles = 0
+    for profile in profiles:
+        profile_ids = np.asarray(profile, dtype=np.int64)
+        ids.append(profile_ids)
+        rows.append(np.full(len(profile_ids), n_profiles, dtype=np.int64))
+        n_profiles += 1
+
+    matrix = np.zeros((n_profiles, bitset_words(n_bits)), dtype=np.uint64)
+    if n_profiles:
+        all_ids = np.concatenate(ids)
+        np.bitwise_or.at(
+            matrix, (np.concatenate(rows), all_ids >> 6),
+            np.left_shift(np.uint64(1), (all_ids & 63).astype(np.uint64))
+        )
+    return matrix
+
+
+def screen_profiles(jd_bits: np.ndarray, profile_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Exact matched/missing/extra counts of many profiles against one JD
+
+    Args:
+        jd_bits: JD bitset
+        profile_matrix: Matrix from encode_profiles
+
+    Returns:
+        dict: {'matched', 'missing', 'extra'}: int64 arrays, one count per profile
+    """
+    profile_matrix, jd_bits = _aligned(profile_matrix, jd_bits)
+
+    # |jd - p| and |p - jd| follow from |p & jd|, so one AND pass suffices
+    matched = popcount(profile_matrix & jd_bits)
+    return {
+        'matched': matched,
+        'missing': int(popcount(jd_bits)) - matched,
+        'extra': popcount(profile_matrix) - matched
+    }
\ No newline at end of file
@@ -4,17 +4,79 @@ Combines NLP, regex, and confidence scoring
 Features from both implementations + enhancements
 """
 
+import os
 import re
-import spacy
-from typing import Dict, List, Tuple
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Union
+from utils.cache_store import TieredCache, content_hash
+from utils.process_context import get_process_context
+from utils.skill_registry import SkillRegistry
+from utils.taxonomy_index import TaxonomyIndex, load_taxonomy_index
 
-# Try to load spacy model, download if not available
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# spaCy model used for the NER fallback
+SPACY_MODEL = "en_core_web_sm"
+
+# Pipeline components extraction never reads (only doc.ents is used)
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+# Extraction modes: "accurate" runs the NER fallback, "fast" skips spaCy entirely
+EXTRACTION_MODES = ("accurate", "fast")
+
+# Texts longer than this are streamed in chunks (spaCy's default max_length)
+MAX_NLP_CHARS = 1000000
+
+# Chunk size and NER overlap (in characters) for streaming extraction
+STREAM_CHUNK_SIZE = 100000
+STREAM_OVERLAP = 200
+
+# Max characters between a skill and a following "N years" mention
+YEARS_WINDOW = 60
+
+# Bump whenever scoring changes so cached extractions are not reused
+EXTRACTOR_VERSION = "1"
+
+# Entries kept in the in-memory extraction cache
+EXTRACTION_CACHE_SIZE = 256
+
+_extraction_cache = TieredCache(EXTRACTION_CACHE_SIZE)
+
+_YEARS_PATTERN = re.compile(r'(\d+)\+?\s*years?')
+_YEARS_GAP_BEFORE = re.compile(r'\s+(?:of\s+)?')
+_YEARS_GAP_PAREN = re.compile(r'\s*\(')
+
+_nlp = None
+_nlp_loaded = False
+
+def get_nlp():
+    """
+    Load the trimmed spaCy pipeline lazily, once per process
+    
+    Returns:
+        Language: NER-only pipeline, or None if spaCy or the model is unavailable
+    """
+    global _nlp, _nlp_loaded
+    
+    if not _nlp_loaded:
+        _nlp_loaded = True
+        try:
+            import spacy
+            nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            
+            # Drop the shared tok2vec when no remaining component listens to it
+            if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+                nlp.remove_pipe("tok2vec")
+            
+            _nlp = nlp
+        except Exception as e:
+            print(
+                f"spaCy model '{SPACY_MODEL}' unavailable ({e}); "
+                f"NER fallback disabled. Install it with: python -m spacy download {SPACY_MODEL}"
+            )
+    
+    return _nlp
 
 # Comprehensive Skill Taxonomy (500+ skills categorized)
 SKILL_DATABASE = {
@@ -122,53 +184,101 @@ SKILL_DATABASE = {
     ]
 }
 
-def extract_skills_with_confidence(text: str) -> Dict[str, Dict[str, int]]:
+# Compiled taxonomy index (loaded from disk or built on first use)
+_taxonomy_index = None
+_skill_registry = None
+
+def get_taxonomy_index() -> TaxonomyIndex:
     """
-    Extract skills with confidence scores using multiple methods
+    Get the compiled index for SKILL_DATABASE, once per process
+    
+    Returns:
+        TaxonomyIndex: Skill IDs, categories and the compiled matcher
+    """
+    global _taxonomy_index
+    
+    if _taxonomy_index is None:
+        _taxonomy_index = load_taxonomy_index(SKILL_DATABASE)
+    
+    return _taxonomy_index
+
+def get_skill_registry() -> SkillRegistry:
+    """
+    Get the process-wide skill registry shared by extractor, comparator
+    and recommender (taxonomy skills keep their TaxonomyIndex IDs)
+    
+    Returns:
+        SkillRegistry: Interned skill IDs and display names
+    """
+    global _skill_registry
+    
+    if _skill_registry is None:
+        _skill_registry = SkillRegistry(get_taxonomy_index().skills)
+    
+    return _skill_registry
+
+def _match_entities(doc, index: TaxonomyIndex) -> Set[int]:
+    """
+    Find the skills contained in any spaCy entity with one matcher pass
     
     Args:
-        text (str): Input text to extract skills from
+        doc: Processed spaCy document (None when NER is skipped)
+        index: Compiled taxonomy index
     
     Returns:
-        dict: {category: {skill: confidence_score}}
+        set: IDs of skills that occur inside at least one entity
     """
-    if not text:
-        return {}
+    if doc is None or not doc.ents:
+        return set()
     
-    text_lower = text.lower()
+    # Skills never contain NUL, so a hit cannot straddle two entities
+    entity_text = '\x00'.join(ent.text.lower() for ent in doc.ents)
     
-    # Process with spaCy for better context
-    doc = nlp(text_lower[:1000000])  # Limit for performance
+    return {skill_id for skill_id, _, _, _ in index.matcher.find_all(entity_text)}
+
+def _score_skills(match_counts: Dict[int, Tuple[int, int]], entity_skill_ids: Set[int],
+                  index: TaxonomyIndex) -> Dict[str, Dict[str, int]]:
+    """
+    Turn raw match counts into categorized confidence scores
+    
+    Args:
+        match_counts: {skill_id: (word_bounded_count, substring_count)}
+        entity_skill_ids: IDs of skills found inside spaCy entities
+        index: Compiled taxonomy index
     
+    Returns:
+        dict: {category: {skill: confidence_score}}
+    """
+    registry = get_skill_registry()
     extracted_skills = {}
     
-    for category, skills in SKILL_DATABASE.items():
+    for category, skill_ids in index.category_skill_ids.items():
         category_skills = {}
         
-        for skill in skills:
+        for skill_id in skill_ids:
+            skill = registry.display(skill_id)
+            
             # Multiple detection methods for higher accuracy
             confidence = 0
             
+            exact_matches, substring_matches = match_counts.get(skill_id, (0, 0))
+            
             # Method 1: Exact word boundary match (highest confidence)
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            exact_matches = len(re.findall(pattern, text_lower))
             if exact_matches > 0:
                 confidence = min(95, 75 + (exact_matches * 5))
-                category_skills[skill.title()] = confidence
+                category_skills[skill] = confidence
                 continue
             
             # Method 2: Fuzzy match (medium confidence)
-            if skill in text_lower:
+            if substring_matches > 0:
                 confidence = 70
-                category_skills[skill.title()] = confidence
+                category_skills[skill] = confidence
                 continue
             
             # Method 3: SpaCy NER and similarity (lower confidence)
-            for ent in doc.ents:
-                if skill.lower() in ent.text.lower():
-                    confidence = 65
-                    category_skills[skill.title()] = confidence
-                    break
+            if skill_id in entity_skill_ids:
+                confidence = 65
+                category_skills[skill] = confidence
         
         if category_skills:
             # Apply decay to confidence scores based on order
@@ -185,13 +295,330 @@ def extract_skills_with_confidence(text: str) -> Dict[str, Dict[str, int]]:
     
     return extracted_skills
 
-def highlight_text(text: str, skills: List[str]) -> str:
+def _check_mode(mode: str):
+    """Validate an extraction mode argument"""
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode!r} (expected one of {EXTRACTION_MODES})")
+
+def configure_extraction_cache(max_entries: int = EXTRACTION_CACHE_SIZE, disk_dir: str = None,
+                               max_disk_bytes: int = 256 * 1024 * 1024):
+    """
+    Replace the extraction cache, e.g. to enable the on-disk tier
+    
+    Args:
+        max_entries (int): Size bound of the in-memory LRU tier
+        disk_dir (str): Directory for the on-disk tier (None = memory only)
+        max_disk_bytes (int): Size bound of the on-disk tier
+    """
+    global _extraction_cache
+    _extraction_cache = TieredCache(max_entries, disk_dir, max_disk_bytes)
+
+def _copy_skills(skills: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    """Shallow per-category copy so callers cannot mutate cached results"""
+    return {category: dict(category_skills) for category, category_skills in skills.items()}
+
+def extract_skills_with_confidence(text: str, mode: str = "accurate", return_spans: bool = False,
+                                   use_cache: bool = True):
+    """
+    Extract skills with confidence scores using multiple methods
+    
+    Results are memoized by a hash of the lowercased text, the mode and the
+    taxonomy hash, so reruns and repeated uploads skip extraction entirely.
+    
+    Args:
+        text (str): Input text to extract skills from
+        mode (str): "accurate" (taxonomy matcher + spaCy NER fallback) or
+            "fast" (taxonomy matcher only, for high-volume screening)
+        return_spans (bool): Also return the character offsets of every
+            word-boundary skill hit, ready for highlight_text
+        use_cache (bool): Look up and store results in the extraction cache
+    
+    Returns:
+        dict: {category: {skill: confidence_score}}, or a tuple
+            (skills, [(start, end, skill), ...]) when return_spans is True
+    """
+    _check_mode(mode)
+    
+    if not text:
+        return ({}, []) if return_spans else {}
+    
+    cached = None
+    if use_cache:
+        index = get_taxonomy_index()
+        cache_key = content_hash(EXTRACTOR_VERSION, mode, index.taxonomy_hash, text.lower())
+        cached = _extraction_cache.get(cache_key)
+    
+    if cached is not None and (cached[1] is not None or not return_spans):
+        skills, spans = cached
+    else:
+        skills, spans = _extract_uncached(text, mode, return_spans)
+        if use_cache:
+            _extraction_cache.put(cache_key, (skills, spans))
+    
+    if return_spans:
+        return _copy_skills(skills), list(spans)
+    return _copy_skills(skills)
+
+def _extract_uncached(text: str, mode: str, return_spans: bool):
+    """
+    Run extraction for one non-empty text, bypassing the cache
+    
+    Returns:
+        tuple: (skills, spans), spans is None unless return_spans is True
+    """
+    # Long documents are streamed in chunks instead of being truncated for spaCy
+    if len(text) > MAX_NLP_CHARS:
+        skills = extract_skills_streaming(text, mode=mode)
+        spans = find_skill_spans(text, get_all_skills_flat(skills)) if return_spans else None
+        return skills, spans
+    
+    text_lower = text.lower()
+    
+    # Process with spaCy for better context
+    nlp = get_nlp() if mode == "accurate" else None
+    doc = nlp(text_lower) if nlp is not None else None
+    
+    # Single pass over the text finds every skill occurrence at once
+    index = get_taxonomy_index()
+    hits = list(index.matcher.find_all(text_lower))
+    match_counts = index.matcher.count_hits(hits)
+    
+    # Reverse entity index: every skill mentioned inside any entity
+    entity_skill_ids = _match_entities(doc, index)
+    
+    skills = _score_skills(match_counts, entity_skill_ids, index)
+    
+    if not return_spans:
+        return skills, None
+    
+    if len(text_lower) != len(text):
+        # Lowercasing changed the length (rare Unicode), offsets would drift
+        return skills, find_skill_spans(text, get_all_skills_flat(skills))
+    
+    registry = get_skill_registry()
+    spans = [(start, end, registry.display(skill_id))
+             for skill_id, start, end, bounded in hits if bounded]
+    
+    return skills, spans
+
+def _rechunk(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Regroup text pieces of any size into chunks of chunk_size characters
+    
+    Args:
+        pieces: Text pieces in order (lines, file reads, one large string...)
+        chunk_size: Characters per chunk (the last chunk may be shorter)
+    
+    Yields:
+        str: Consecutive chunks of the concatenated text
+    """
+    parts = []
+    size = 0
+    
+    for piece in pieces:
+        if not piece:
+            continue
+        
+        parts.append(piece)
+        size += len(piece)
+        
+        if size >= chunk_size:
+            buffer = ''.join(parts)
+            cut = size - size % chunk_size
+            for start in range(0, cut, chunk_size):
+                yield buffer[start:start + chunk_size]
+            
+            rest = buffer[cut:]
+            parts = [rest] if rest else []
+            size = len(rest)
+    
+    if parts:
+        yield ''.join(parts)
+
+def extract_skills_streaming(chunks: Union[str, Iterable[str]], mode: str = "accurate",
+                             chunk_size: int = STREAM_CHUNK_SIZE) -> Dict[str, Dict[str, int]]:
+    """
+    Extract skills from arbitrarily long input in bounded memory
+    
+    The input is regrouped into fixed-size chunks. The taxonomy matcher
+    carries its state across chunks, so skills on chunk edges are counted
+    exactly once. spaCy sees each chunk together with the last
+    STREAM_OVERLAP characters of the previous one, so entities on an edge
+    are seen whole; entity hits are merged as a set, so the overlap never
+    double-counts.
+    
+    Args:
+        chunks: A string or an iterable of text pieces (e.g. an open file)
+        mode (str): "accurate" or "fast", as in extract_skills_with_confidence
+        chunk_size (int): Characters per chunk
+    
+    Returns:
+        dict: {category: {skill: confidence_score}}
+    """
+    _check_mode(mode)
+    
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    chunk_size = max(1, min(chunk_size, MAX_NLP_CHARS - STREAM_OVERLAP))
+    
+    index = get_taxonomy_index()
+    nlp = get_nlp() if mode == "accurate" else None
+    entity_skill_ids = set()
+    
+    def lowered_chunks():
+        tail = ""
+        for chunk in _rechunk(chunks, chunk_size):
+            chunk_lower = chunk.lower()
+            if nlp is not None:
+                doc = nlp(tail + chunk_lower)
+                entity_skill_ids.update(_match_entities(doc, index))
+                tail = chunk_lower[-STREAM_OVERLAP:]
+            yield chunk_lower
+    
+    match_counts = index.matcher.count_hits(index.matcher.find_all_stream(lowered_chunks()))
+    
+    return _score_skills(match_counts, entity_skill_ids, index)
+
+def _extract_chunk(texts: List[str], mode: str, batch_size: int) -> List[Dict[str, Dict[str, int]]]:
+    """
+    Extract skills for a list of texts in the current process
+    
+    Streams the non-empty texts through nlp.pipe and the taxonomy matcher.
+    Also used as the unit of work for pool workers, which load the taxonomy
+    index and spaCy model once per worker process.
+    
+    Args:
+        texts: Input texts
+        mode: Extraction mode
+        batch_size: spaCy nlp.pipe batch size
+    
+    Returns:
+        list: One {category: {skill: confidence}} dict per input text
+    """
+    index = get_taxonomy_index()
+    nlp = get_nlp() if mode == "accurate" else None
+    
+    lowered = [text.lower() if text else "" for text in texts]
+    regular = [text_lower for text_lower in lowered if 0 < len(text_lower) <= MAX_NLP_CHARS]
+    
+    if nlp is not None:
+        docs = iter(nlp.pipe(regular, batch_size=batch_size))
+    else:
+        docs = None
+    
+    results = []
+    for text_lower in lowered:
+        if not text_lower:
+            results.append({})
+            continue
+        
+        if len(text_lower) > MAX_NLP_CHARS:
+            results.append(extract_skills_streaming(text_lower, mode=mode))
+            continue
+        
+        doc = next(docs) if docs is not None else None
+        match_counts = index.matcher.match_counts(text_lower)
+        entity_skill_ids = _match_entities(doc, index)
+        results.append(_score_skills(match_counts, entity_skill_ids, index))
+    
+    return results
+
+def _iter_batches(texts: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Lazily group an iterable of texts into lists of batch_size"""
+    iterator = iter(texts)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def extract_skills_batch(texts: Iterable[str], n_process: int = 1, batch_size: int = 64,
+                         mode: str = "accurate") -> Iterator[Dict[str, Dict[str, int]]]:
+    """
+    Extract skills from many documents, yielding results in input order
+    
+    Texts are consumed lazily in batches of batch_size. With n_process > 1
+    each batch is handed to a worker process; at most two batches per worker
+    are in flight, so memory stays bounded for arbitrarily long streams.
+    
+    Args:
+        texts: Iterable of input texts
+        n_process (int): Worker processes (1 = in-process, -1 = all CPUs)
+        batch_size (int): Documents per batch (also the nlp.pipe batch size)
+        mode (str): "accurate" or "fast", as in extract_skills_with_confidence
+    
+    Yields:
+        dict: {category: {skill: confidence_score}} for each input text
+    """
+    _check_mode(mode)
+    
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    
+    batches = _iter_batches(texts, batch_size)
+    
+    if n_process <= 1:
+        for batch in batches:
+            yield from _extract_chunk(batch, mode, batch_size)
+        return
+    
+    # Make sure the index artifact exists before workers try to load it
+    get_taxonomy_index()
+    
+    # Never fork the (possibly multi-threaded) caller
+    with ProcessPoolExecutor(max_workers=n_process, mp_context=get_process_context()) as executor:
+        pending = deque()
+        
+        for batch in batches:
+            pending.append(executor.submit(_extract_chunk, batch, mode, batch_size))
+            
+            if len(pending) >= 2 * n_process:
+                yield from pending.popleft().result()
+        
+        while pending:
+            yield from pending.popleft().result()
+
+def find_skill_spans(text: str, skills: List[str]) -> List[Tuple[int, int, str]]:
+    """
+    Locate word-boundary occurrences of arbitrary skills in one regex pass
+    
+    Args:
+        text (str): Original text
+        skills (list): Skills to locate
+    
+    Returns:
+        list: [(start, end, skill), ...] in text order, non-overlapping
+    """
+    if not text or not skills:
+        return []
+    
+    # Longest first so the alternation prefers "React Native" over "React"
+    sorted_skills = sorted(set(skills), key=len, reverse=True)
+    canonical = {skill.lower(): skill for skill in sorted_skills}
+    
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(re.escape(skill) for skill in sorted_skills) + r')\b',
+        re.IGNORECASE
+    )
+    
+    return [(m.start(), m.end(), canonical.get(m.group(0).lower(), m.group(0)))
+            for m in pattern.finditer(text)]
+
+def highlight_text(text: str, skills: List[str] = None,
+                   spans: List[Tuple[int, int, str]] = None) -> str:
     """
     Highlight skills in text with HTML spans
     
+    The HTML is assembled in one linear pass over the text. Overlapping
+    spans are resolved leftmost-longest, so a longer skill wins over any
+    skill nested inside it.
+    
     Args:
         text (str): Original text
-        skills (list): List of skills to highlight
+        skills (list): List of skills to highlight (used when spans is None)
+        spans (list): [(start, end, skill), ...] offsets, e.g. from
+            extract_skills_with_confidence(text, return_spans=True)
     
     Returns:
         str: HTML with highlighted skills
@@ -199,23 +626,23 @@ def highlight_text(text: str, skills: List[str]) -> str:
     if not text:
         return ""
     
-    highlighted = text
+    if spans is None:
+        spans = find_skill_spans(text, skills or [])
     
-    # Sort skills by length (longest first) to avoid partial replacements
-    sorted_skills = sorted(skills, key=len, reverse=True)
+    parts = []
+    position = 0
     
-    for skill in sorted_skills:
-        # Case-insensitive replacement with word boundaries
-        pattern = re.compile(r'\b(' + re.escape(skill) + r')\b', re.IGNORECASE)
-        highlighted = pattern.sub(
-            lambda m: f"<span class='highlight'>{m.group(0)}</span>",
-            highlighted
-        )
+    for start, end, _ in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if start < position:
+            continue
+        parts.append(text[position:start])
+        parts.append(f"<span class='highlight'>{text[start:end]}</span>")
+        position = end
     
-    # Convert newlines to HTML breaks
-    highlighted = highlighted.replace('\n', '<br>')
+    parts.append(text[position:])
     
-    return highlighted
+    # Convert newlines to HTML breaks
+    return ''.join(parts).replace('\n', '<br>')
 
 def get_all_skills_flat(skills_dict: Dict[str, Dict[str, int]]) -> List[str]:
     """
@@ -323,11 +750,12 @@ def extract_years_of_experience(text: str, skill: str) -> int:
     text_lower = text.lower()
     skill_lower = skill.lower()
     
-    # Patterns like "5 years of Python", "Python (3+ years)"
+    # Patterns like "5 years of Python", "Python (3+ years)"; the last one is
+    # bounded so it cannot scan to the end of a single-line document
     patterns = [
         rf'(\d+)\+?\s*years?\s+(?:of\s+)?{re.escape(skill_lower)}',
         rf'{re.escape(skill_lower)}\s*\((\d+)\+?\s*years?\)',
-        rf'{re.escape(skill_lower)}.*?(\d+)\+?\s*years?'
+        rf'{re.escape(skill_lower)}.{{0,{YEARS_WINDOW}}}?(\d+)\+?\s*years?'
     ]
     
     for pattern in patterns:
@@ -338,4 +766,68 @@ def extract_years_of_experience(text: str, skill: str) -> int:
             except:
                 continue
     
-    return 0
\ No newline at end of file
+    return 0
+
+def extract_all_years_of_experience(text: str, window: int = YEARS_WINDOW) -> Dict[str, int]:
+    """
+    Extract years of experience for every taxonomy skill in one pass
+    
+    All "N years" mentions are found with one regex pass and all skill hits
+    with one matcher pass; each hit is then paired with nearby mentions by
+    binary search. Precedence per skill mirrors extract_years_of_experience:
+    "5 years of Python", then "Python (5 years)", then the first mention
+    after the skill within `window` characters on the same line.
+    
+    Args:
+        text (str): Resume text
+        window (int): Max characters between a skill and a following mention
+    
+    Returns:
+        dict: {skill: years} for skills with a mention (title-cased names)
+    """
+    if not text:
+        return {}
+    
+    text_lower = text.lower()
+    
+    mentions = [(m.start(), m.end(), int(m.group(1))) for m in _YEARS_PATTERN.finditer(text_lower)]
+    if not mentions:
+        return {}
+    
+    mention_starts = [start for start, _, _ in mentions]
+    mention_ends = [end for _, end, _ in mentions]
+    
+    index = get_taxonomy_index()
+    best = {}  # skill_id -> (precedence, position, years)
+    
+    for skill_id, start, end, bounded in index.matcher.find_all(text_lower):
+        if not bounded:
+            continue
+        
+        candidates = []
+        
+        # "5 years of python": mention ending right before the skill
+        i = bisect_right(mention_ends, start) - 1
+        if i >= 0 and _YEARS_GAP_BEFORE.fullmatch(text_lower, mention_ends[i], start):
+            candidates.append((0, mentions[i][0], mentions[i][2]))
+        
+        # First mention starting after the skill
+        j = bisect_left(mention_starts, end)
+        if j < len(mentions):
+            m_start, m_end, years = mentions[j]
+            
+            # "python (5 years)"
+            if (_YEARS_GAP_PAREN.fullmatch(text_lower, end, m_start) and
+                    text_lower.startswith(')', m_end)):
+                candidates.append((1, start, years))
+            
+            # "python ... 5 years" on the same line
+            elif m_start - end <= window and '\n' not in text_lower[end:m_start]:
+                candidates.append((2, start, years))
+        
+        for candidate in candidates:
+            if skill_id not in best or candidate < best[skill_id]:
+                best[skill_id] = candidate
+    
+    registry = get_skill_registry()
+    return {registry.display(skill_id): years for skill_id, (_, _, years) in best.items()}
\ No newline at end of file
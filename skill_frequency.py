@@ -0,0 +1,161 @@
+"""
+Corpus Skill Frequency Model
+Document frequencies of skills over every job description processed so far,
+persisted in SQLite and updated incrementally, for rarity (IDF) and demand
+"""
+
+import math
+import sqlite3
+import threading
+from typing import Dict, Iterable, List
+
+# SQLite file holding the JD corpus statistics
+FREQUENCY_DB_PATH = "skill_frequency.db"
+
+# Below this many JDs the statistics are too noisy to influence scoring
+MIN_CORPUS_DOCS = 20
+
+# A skill required by every JD has its priority score scaled by 1 + DEMAND_BOOST
+DEMAND_BOOST = 0.5
+
+_frequency_model = None
+_frequency_model_lock = threading.Lock()
+
+
+class SkillFrequencyModel:
+    """
+    Document-frequency counts of skills across job descriptions
+
+    Each JD is recorded once (by ID) and adds one to the count of every
+    distinct skill it mentions, so an update costs O(skills in the JD).
+    Counts are mirrored in memory for lookups.
+    """
+
+    def __init__(self, db_path: str = FREQUENCY_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS skill_df ("
+                "skill TEXT PRIMARY KEY, df INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS corpus_docs (doc_id TEXT PRIMARY KEY)"
+            )
+
+        self.reload()
+
+    def reload(self):
+        """Re-read the counts (e.g. after other processes recorded JDs)"""
+        with self._lock:
+            self._df: Dict[str, int] = dict(self._conn.execute("SELECT skill, df FROM skill_df"))
+            self.n_docs = self._conn.execute("SELECT COUNT(*) FROM corpus_docs").fetchone()[0]
+
+    def add_document(self, doc_id: str, skills: Iterable[str]) -> bool:
+        """
+        Record one job description
+
+        Args:
+            doc_id: Stable JD identifier (e.g. its profile ID)
+            skills: Skills the JD requires (any case, duplicates ignored)
+
+        Returns:
+            bool: False if the JD had already been recorded
+        """
+        canonical = sorted({skill.lower() for skill in skills})
+
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO corpus_docs (doc_id) VALUES (?)", (doc_id,)
+            ).rowcount
+            if not inserted:
+                return False
+
+            self._conn.executemany(
+                "INSERT INTO skill_df (skill, df) VALUES (?, 1) "
+                "ON CONFLICT(skill) DO UPDATE SET df = df + 1",
+                [(skill,) for skill in canonical]
+            )
+
+            self.n_docs += 1
+            for skill in canonical:
+                self._df[skill] = self._df.get(skill, 0) + 1
+
+        return True
+
+    @property
+    def is_informative(self) -> bool:
+        """Whether enough JDs have been seen to use the statistics"""
+        return self.n_docs >= MIN_CORPUS_DOCS
+
+    def document_frequency(self, skill: str) -> int:
+        """Number of recorded JDs requiring a skill"""
+        return self._df.get(skill.lower(), 0)
+
+    def demand(self, skill: str) -> float:
+        """Share of recorded JDs requiring a skill (0 to 1)"""
+        if not self.n_docs:
+            return 0.0
+        return self.document_frequency(skill) / self.n_docs
+
+    def idf(self, skill: str) -> float:
+        """
+        Smoothed inverse document frequency (rarity) of a skill
+
+        Same formula as scikit-learn's smooth_idf: ln((1 + N) / (1 + df)) + 1
+        """
+        return math.log((1 + self.n_docs) / (1 + self.document_frequency(skill))) + 1
+
+    def match_weights(self, skills: Iterable[str]) -> List[float]:
+        """
+        Match weight of each skill: its IDF, or 1.0 while the corpus is small
+
+        Args:
+            skills: Skill names
+
+        Returns:
+            list: One weight per skill
+        """
+        if not self.is_informative:
+            return [1.0 for _ in skills]
+        return [self.idf(skill) for skill in skills]
+
+    def priority_factor(self, skill: str) -> float:
+        """Multiplier applied to a missing skill's JD confidence for its priority"""
+        if not self.is_informative:
+            return 1.0
+        return 1.0 + DEMAND_BOOST * self.demand(skill)
+
+
+def get_frequency_model() -> SkillFrequencyModel:
+    """
+    Shared frequency model, opened on first use
+
+    Returns:
+        SkillFrequencyModel: Model backed by FREQUENCY_DB_PATH
+    """
+    global _frequency_model
+
+    if _frequency_model is None:
+        with _frequency_model_lock:
+            if _frequency_model is None:
+                _frequency_model = SkillFrequencyModel()
+
+    return _frequency_model
+
+
+def configure_frequency_model(db_path: str = FREQUENCY_DB_PATH) -> SkillFrequencyModel:
+    """
+    Point the shared model at another SQLite file
+
+    Args:
+        db_path (str): Database path (":memory:" for a throwaway model)
+
+    Returns:
+        SkillFrequencyModel: The new shared model
+    """
+    global _frequency_model
+    _frequency_model = SkillFrequencyModel(db_path)
+    return _frequency_model
\ No newline at end of file
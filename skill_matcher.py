@@ -0,0 +1,210 @@
+"""
+Multi-Pattern Skill Matcher
+Aho-Corasick automaton that finds every taxonomy skill in a single pass
+over the text, including word-boundary status for each hit
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def is_word_char(ch: str) -> bool:
+    """
+    Mirror the regex definition of a word character (\\w)
+
+    Args:
+        ch (str): Single character
+
+    Returns:
+        bool: True if the character is alphanumeric or underscore
+    """
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of lowercase skill strings
+
+    Every occurrence of every pattern (overlapping ones included) is found
+    in one left-to-right scan, so the cost grows with text length and not
+    with text length x number of skills.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._lengths = [len(p) for p in self.patterns]
+
+        # State 0 is the root of the trie
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            self._add_pattern(pattern_id, pattern)
+
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern_id: int, pattern: str):
+        """Insert a pattern into the trie"""
+        if not pattern:
+            return
+
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][ch] = next_state
+            state = next_state
+
+        self._output[state] = self._output[state] + (pattern_id,)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+
+                # Inherit outputs of the longest proper suffix state
+                inherited = self._output[self._fail[next_state]]
+                if inherited:
+                    self._output[next_state] = self._output[next_state] + inherited
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int, int, bool]]:
+        """
+        Yield every pattern occurrence in the text
+
+        Args:
+            text (str): Lowercased input text
+
+        Yields:
+            tuple: (pattern_id, start, end, word_bounded) ordered by end offset
+        """
+        return self.find_all_stream((text,))
+
+    def find_all_stream(self, chunks: Iterable[str]) -> Iterator[Tuple[int, int, int, bool]]:
+        """
+        Yield every pattern occurrence across consecutive text chunks
+
+        The automaton state and a short tail of the previous chunk are carried
+        over, so hits that straddle chunk edges are found exactly once and
+        memory stays bounded by the chunk size. Offsets are global.
+
+        Args:
+            chunks: Lowercased text pieces, in order
+
+        Yields:
+            tuple: (pattern_id, start, end, word_bounded) ordered by end offset
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+        state = 0
+
+        # Enough context for the longest pattern plus the char before it
+        keep = max(lengths, default=0) + 1
+        carry = ""
+        carry_offset = 0
+        pending = []
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            buffer = carry + chunk
+            buffer_len = len(buffer)
+
+            # Hits that ended on the previous chunk's last char need this char
+            if pending:
+                after = is_word_char(chunk[0])
+                for pattern_id, start, end, bounded, last in pending:
+                    yield pattern_id, start, end, bounded and after != last
+                pending = []
+
+            for i in range(len(carry), buffer_len):
+                ch = buffer[i]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+
+                if not output[state]:
+                    continue
+
+                end = i + 1
+                last = is_word_char(ch)
+                for pattern_id in output[state]:
+                    start = end - lengths[pattern_id]
+
+                    # Same semantics as r'\b' + re.escape(skill) + r'\b'
+                    before = start > 0 and is_word_char(buffer[start - 1])
+                    bounded = before != is_word_char(buffer[start])
+
+                    if end < buffer_len:
+                        after = is_word_char(buffer[end])
+                        yield (pattern_id, start + carry_offset, end + carry_offset,
+                               bounded and after != last)
+                    else:
+                        pending.append((pattern_id, start + carry_offset,
+                                        end + carry_offset, bounded, last))
+
+            carry = buffer[-keep:]
+            carry_offset += buffer_len - len(carry)
+
+        # End of text counts as a non-word char
+        for pattern_id, start, end, bounded, last in pending:
+            yield pattern_id, start, end, bounded and last
+
+    def match_counts(self, text: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Count occurrences of every pattern in one pass
+
+        Word-bounded hits are counted without overlap, exactly like
+        re.findall with a word-boundary pattern would count them.
+
+        Args:
+            text (str): Lowercased input text
+
+        Returns:
+            dict: {pattern_id: (word_bounded_count, substring_count)}
+        """
+        return self.count_hits(self.find_all(text))
+
+    @staticmethod
+    def count_hits(hits: Iterable[Tuple[int, int, int, bool]]) -> Dict[int, Tuple[int, int]]:
+        """
+        Aggregate hits from find_all or find_all_stream into counts
+
+        Args:
+            hits: (pattern_id, start, end, word_bounded) ordered by end offset
+
+        Returns:
+            dict: {pattern_id: (word_bounded_count, substring_count)}
+        """
+        counts = {}
+        last_bounded_end = {}
+
+        for pattern_id, start, end, bounded in hits:
+            exact, total = counts.get(pattern_id, (0, 0))
+            total += 1
+
+            if bounded and start >= last_bounded_end.get(pattern_id, 0):
+                exact += 1
+                last_bounded_end[pattern_id] = end
+
+            counts[pattern_id] = (exact, total)
+
+        return counts
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Interned Skill Registry
+Maps canonical skill names to dense integer IDs and stores their display
+names once, so pipelines can pass compact ID arrays instead of strings
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class SkillRegistry:
+    """
+    Dense, append-only interning table for skills
+
+    Canonical form is the lowercased name and the display form is its
+    title-cased version, matching what extraction reports. Taxonomy skills
+    are interned first, so their IDs equal TaxonomyIndex skill IDs; skills
+    outside the taxonomy get the next free ID on first sight.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self._lookup: Dict[str, int] = {}
+        self._canonical: List[str] = []
+        self._display: List[str] = []
+        self._lock = threading.Lock()
+
+        for skill in skills:
+            self.intern(skill)
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def intern(self, skill: str) -> int:
+        """
+        Get the ID of a skill, registering it if it is new
+
+        Only the canonical (lowercased) name is stored, so other spellings
+        ("Python", "PYTHON") do not grow the table.
+
+        Args:
+            skill (str): Skill name in any case
+
+        Returns:
+            int: Skill ID
+        """
+        canonical = skill.lower()
+        skill_id = self._lookup.get(canonical)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._lookup.get(canonical)
+            if skill_id is None:
+                skill_id = len(self._canonical)
+                self._canonical.append(canonical)
+                self._display.append(canonical.title())
+                self._lookup[canonical] = skill_id
+
+        return skill_id
+
+    def get_id(self, skill: str) -> Optional[int]:
+        """Look up a skill without registering it, None if unknown"""
+        return self._lookup.get(skill.lower())
+
+    def canonical(self, skill_id: int) -> str:
+        """Lowercased name of a skill ID"""
+        return self._canonical[skill_id]
+
+    def display(self, skill_id: int) -> str:
+        """Title-cased display name of a skill ID"""
+        return self._display[skill_id]
+
+    def intern_many(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Intern several skills at once
+
+        Args:
+            skills: Skill names
+
+        Returns:
+            np.ndarray: int32 array of skill IDs, in input order
+        """
+        return np.fromiter((self.intern(skill) for skill in skills), dtype=np.int32)
+
+    def display_many(self, skill_ids: Iterable[int]) -> List[str]:
+        """Display names for several skill IDs"""
+        display = self._display
+        return [display[skill_id] for skill_id in skill_ids]
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+Compiled Taxonomy Index
+Normalized skills, integer skill IDs, category membership and the compiled
+matcher, built once per process and persisted to disk by taxonomy hash
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.skill_matcher import SkillMatcher
+
+# Bump whenever the layout of TaxonomyIndex changes
+INDEX_VERSION = 1
+
+# Directory for on-disk artifacts (index, caches, fitted models)
+CACHE_DIR = "cache"
+
+
+def compute_taxonomy_hash(taxonomy: Dict[str, List[str]]) -> str:
+    """
+    Stable hash of a taxonomy (category order and skill order included)
+
+    Args:
+        taxonomy: {category: [skills]}
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {'version': INDEX_VERSION, 'taxonomy': list(taxonomy.items())},
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TaxonomyIndex:
+    """
+    Compiled, immutable view of a skill taxonomy
+
+    Attributes:
+        taxonomy_hash: Hash of the taxonomy the index was built from
+        skills: Normalized (lowercase) skill strings, indexed by skill ID
+        skill_ids: {normalized skill: skill ID}
+        categories: Category names in taxonomy order
+        category_skill_ids: {category: [skill IDs in taxonomy order]}
+        skill_categories: Categories of each skill, indexed by skill ID
+        matcher: Aho-Corasick matcher whose pattern IDs are skill IDs
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.version = INDEX_VERSION
+        self.taxonomy_hash = compute_taxonomy_hash(taxonomy)
+
+        self.skills: List[str] = []
+        self.skill_ids: Dict[str, int] = {}
+        self.categories: List[str] = list(taxonomy.keys())
+        self.category_skill_ids: Dict[str, List[int]] = {}
+        self.skill_categories: List[List[str]] = []
+
+        for category, skills in taxonomy.items():
+            ids = []
+            for skill in skills:
+                normalized = skill.lower()
+                skill_id = self.skill_ids.get(normalized)
+                if skill_id is None:
+                    skill_id = len(self.skills)
+                    self.skill_ids[normalized] = skill_id
+                    self.skills.append(normalized)
+                    self.skill_categories.append([])
+                if category not in self.skill_categories[skill_id]:
+                    self.skill_categories[skill_id].append(category)
+                ids.append(skill_id)
+            self.category_skill_ids[category] = ids
+
+        self.matcher = SkillMatcher(self.skills)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def get_skill_id(self, skill: str) -> Optional[int]:
+        """Look up the ID of a skill (case-insensitive), None if unknown"""
+        return self.skill_ids.get(skill.lower())
+
+
+def get_artifact_path(name: str, taxonomy_hash: str, version: int = INDEX_VERSION,
+                      cache_dir: str = CACHE_DIR) -> str:
+    """
+    Path of a persisted artifact derived from a taxonomy
+
+    Args:
+        name: Artifact name (e.g. "taxonomy_index")
+        taxonomy_hash: Hash from compute_taxonomy_hash
+        version: Layout version of the artifact
+        cache_dir: Artifact directory
+
+    Returns:
+        str: File path
+    """
+    return os.path.join(cache_dir, f"{name}_v{version}_{taxonomy_hash[:16]}.pkl")
+
+
+def save_artifact(name: str, taxonomy_hash: str, payload: Any,
+                  version: int = INDEX_VERSION, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Persist an artifact atomically so concurrent workers never see partial files
+
+    Args:
+        name: Artifact name
+        taxonomy_hash: Hash of the taxonomy the artifact was built from
+        payload: Picklable object
+        version: Layout version of the artifact
+        cache_dir: Artifact directory
+
+    Returns:
+        str: Path of the written artifact
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = get_artifact_path(name, taxonomy_hash, version, cache_dir)
+    record = {'version': version, 'taxonomy_hash': taxonomy_hash, 'payload': payload}
+
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def load_artifact(name: str, taxonomy_hash: str, build: Callable[[], Any],
+                  version: int = INDEX_VERSION, cache_dir: str = CACHE_DIR) -> Any:
+    """
+    Load a persisted artifact, building and saving it if the file is
+    missing, stale or unreadable
+
+    Args:
+        name: Artifact name
+        taxonomy_hash: Hash of the taxonomy the artifact derives from
+        build: Zero-argument callable that builds the payload
+        version: Layout version of the artifact
+        cache_dir: Artifact directory
+
+    Returns:
+        The artifact payload
+    """
+    path = get_artifact_path(name, taxonomy_hash, version, cache_dir)
+
+    try:
+        with open(path, 'rb') as f:
+            record = pickle.load(f)
+        if record['version'] == version and record['taxonomy_hash'] == taxonomy_hash:
+            return record['payload']
+    except Exception:
+        pass
+
+    payload = build()
+
+    try:
+        save_artifact(name, taxonomy_hash, payload, version, cache_dir)
+    except OSError as e:
+        print(f"Could not persist {name}: {e}")
+
+    return payload
+
+
+def load_taxonomy_index(taxonomy: Dict[str, List[str]],
+                        cache_dir: str = CACHE_DIR) -> TaxonomyIndex:
+    """
+    Load the persisted index for a taxonomy, building and saving it if the
+    artifact is missing, stale or unreadable
+
+    Args:
+        taxonomy: {category: [skills]}
+        cache_dir: Artifact directory
+
+    Returns:
+        TaxonomyIndex: Compiled index
+    """
+    return load_artifact(
+        "taxonomy_index", compute_taxonomy_hash(taxonomy),
+        lambda: TaxonomyIndex(taxonomy), cache_dir=cache_dir
+    )
\ No newline at end of file
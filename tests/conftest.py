@@ -0,0 +1,40 @@
+"""
+Test configuration
+Makes the package importable as `utils` (its import name in the app) and
+keeps on-disk artifacts out of the working tree
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def _register_package():
+    """Import this checkout as `utils`, whatever its directory is called"""
+    loaded = sys.modules.get('utils')
+    if loaded is not None and PACKAGE_DIR in [os.path.realpath(p) for p in getattr(loaded, '__path__', [])]:
+        return
+
+    spec = importlib.util.spec_from_file_location(
+        'utils', os.path.join(PACKAGE_DIR, '__init__.py'),
+        submodule_search_locations=[PACKAGE_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['utils'] = module
+    spec.loader.exec_module(module)
+
+
+_register_package()
+
+
+@pytest.fixture(autouse=True, scope='session')
+def artifact_dir(tmp_path_factory):
+    """Run in a scratch directory so cache/ artifacts are not written to the repo"""
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('artifacts'))
+    yield
+    os.chdir(previous)
\ No newline at end of file
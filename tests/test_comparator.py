@@ -0,0 +1,86 @@
+"""
+Consistency checks between compare_skills_advanced, compare_against_many
+and rank_candidates
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from utils.comparator import compare_against_many, compare_skills_advanced, rank_candidates
+from utils.skill_extractor import SKILL_DATABASE, extract_skills_with_confidence
+
+SKILLS = [skill for skills in SKILL_DATABASE.values() for skill in skills]
+
+
+def profile(rnd, max_skills):
+    """Skill profile extracted from a random list of taxonomy skills (may be empty)"""
+    text = ' '.join(rnd.choice(SKILLS) for _ in range(rnd.randint(0, max_skills)))
+    return extract_skills_with_confidence(text, mode="fast", use_cache=False)
+
+
+def assert_same(actual, expected, path='result'):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_same(actual[key], expected[key], f"{path}[{key!r}]")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, b) in enumerate(zip(actual, expected)):
+            assert_same(a, b, f"{path}[{i}]")
+    elif isinstance(expected, (float, np.floating)):
+        assert actual == pytest.approx(expected), path
+    else:
+        assert actual == expected, path
+
+
+def random_cases(n_cases, seed):
+    rnd = random.Random(seed)
+    for case in range(n_cases):
+        resume = profile(rnd, 40)
+        jds = [profile(rnd, 30) for _ in range(rnd.randint(0, 12))]
+        if jds and case % 3 == 0:
+            # Out-of-taxonomy skills on both sides
+            jds[0].setdefault('Other', {})['Python Foo'] = 91
+            resume.setdefault('Other', {})['Foo Python Thing'] = 80
+        yield resume, jds
+
+
+def test_compare_against_many_equals_pairwise_comparison():
+    for resume, jds in random_cases(40, seed=9):
+        for jd, result in zip(jds, compare_against_many(resume, jds)):
+            assert_same(result, compare_skills_advanced(resume, jd))
+
+
+def test_empty_resume_misses_every_jd_skill():
+    jd = extract_skills_with_confidence("python docker kubernetes leadership", mode="fast", use_cache=False)
+    expected = compare_skills_advanced({}, jd)
+
+    assert expected['total_missing'] == expected['total_jd_skills'] > 0
+    assert expected['avg_gap'] > 0
+    assert_same(compare_against_many({}, [jd])[0], expected)
+
+    ranked = rank_candidates(jd, [('empty', {})])[0]
+    assert ranked['total_missing'] == expected['total_missing']
+    assert ranked['overall_match'] == expected['overall_match'] == 0
+
+
+def test_empty_jd():
+    resume = extract_skills_with_confidence("python sql", mode="fast", use_cache=False)
+    assert_same(compare_against_many(resume, [{}])[0], compare_skills_advanced(resume, {}))
+
+
+def test_rank_candidates_scores_match_pairwise_comparison():
+    rnd = random.Random(11)
+    jd = profile(rnd, 30)
+    candidates = [(i, profile(rnd, 40)) for i in range(30)] + [('empty', {})]
+
+    ranking = rank_candidates(jd, candidates, top_k=len(candidates), batch_size=7)
+    assert len(ranking) == len(candidates)
+
+    resumes = dict(candidates)
+    for entry in ranking:
+        expected = compare_skills_advanced(resumes[entry['candidate_id']], jd)
+        for key in ('overall_match', 'total_matched', 'total_partial', 'total_missing'):
+            assert entry[key] == pytest.approx(expected[key]), (entry['candidate_id'], key)
\ No newline at end of file
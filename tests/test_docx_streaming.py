@@ -0,0 +1,134 @@
+"""
+Regression checks for the streaming DOCX reader (iter_docx_blocks)
+"""
+
+import io
+import tracemalloc
+import zipfile
+
+from docx import Document
+
+from utils.document_parser import (
+    STATUS_ERROR, STATUS_OK, iter_docx_blocks, parse_docx_document
+)
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+
+def docx_bytes(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def package(body_xml):
+    """Minimal zip holding only word/document.xml with the given body"""
+    xml = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}" xmlns:mc="{MC_NS}"><w:body>{body_xml}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', xml)
+    return buffer.getvalue()
+
+
+def paragraph(text):
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def test_document_order_and_merged_cells():
+    document = Document()
+    document.add_paragraph('Intro')
+    table = document.add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 2)).text = 'Merged Header'
+    table.cell(1, 0).text = 'Python'
+    table.cell(1, 1).text = 'SQL'
+    table.cell(1, 2).merge(table.cell(2, 2)).text = 'Vertical'
+    document.add_paragraph('After')
+
+    # Horizontally and vertically merged cells appear once
+    assert list(iter_docx_blocks(docx_bytes(document))) == [
+        'Intro', 'Merged Header', 'Python SQL Vertical', 'After'
+    ]
+
+
+def test_nested_table_text_belongs_to_outer_cell():
+    document = Document()
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = 'Outer'
+    table.cell(0, 1).add_table(rows=1, cols=2).cell(0, 1).text = 'Nested Docker'
+
+    assert list(iter_docx_blocks(docx_bytes(document))) == ['Outer \nNested Docker\n']
+
+
+def test_runs_tabs_and_breaks():
+    document = Document()
+    tabbed = document.add_paragraph('Skills\tPython')
+    tabbed.add_run().add_break()
+    tabbed.add_run('Kubernetes')
+    document.add_paragraph('   ')
+
+    assert list(iter_docx_blocks(docx_bytes(document))) == ['Skills\tPython\nKubernetes']
+
+
+def test_text_box_included_once():
+    # The text box paragraph closes first, so it is emitted before its anchor
+    text_box = (
+        '<w:p><w:r><w:t>Sidebar: </w:t></w:r><w:r><mc:AlternateContent>'
+        f'<mc:Choice Requires="wps"><w:drawing><w:txbxContent>{paragraph("Go")}</w:txbxContent></w:drawing></mc:Choice>'
+        f'<mc:Fallback><w:pict><w:txbxContent>{paragraph("Go")}</w:txbxContent></w:pict></mc:Fallback>'
+        '</mc:AlternateContent></w:r></w:p>'
+    )
+
+    assert list(iter_docx_blocks(package(text_box))) == ['Go', 'Sidebar: ']
+
+
+def test_ignores_tab_stops_deleted_text_and_field_codes():
+    body = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Kept</w:t></w:r>'
+        '<w:del><w:r><w:delText>Deleted</w:delText></w:r></w:del>'
+        '<w:r><w:instrText>HYPERLINK</w:instrText></w:r></w:p>'
+    )
+
+    assert list(iter_docx_blocks(package(body))) == ['Kept']
+
+
+def long_table(n_rows):
+    rows = ''.join(
+        f'<w:tr><w:tc>{paragraph(f"Row {i}")}</w:tc><w:tc>{paragraph("Python SQL")}</w:tc></w:tr>'
+        for i in range(n_rows)
+    )
+    return package(f'<w:tbl>{rows}</w:tbl>')
+
+
+def peak_memory(data):
+    tracemalloc.start()
+    try:
+        n_blocks = sum(1 for _ in iter_docx_blocks(data))
+        return n_blocks, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_long_table_memory_stays_flat():
+    # Emitted rows must not stay attached to their table until it closes
+    short_blocks, short_peak = peak_memory(long_table(500))
+    long_blocks, long_peak = peak_memory(long_table(5000))
+
+    assert (short_blocks, long_blocks) == (500, 5000)
+    assert long_peak < short_peak + 256 * 1024
+
+
+def test_parse_result_and_errors():
+    document = Document()
+    document.add_paragraph('Python developer')
+    result = parse_docx_document(docx_bytes(document))
+    assert result['status'] == STATUS_OK
+    assert result['text'] == 'Python developer'
+
+    broken = parse_docx_document(b'PK\x03\x04junk')
+    assert broken['status'] == STATUS_ERROR
+    assert broken['error']
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Text statistics helpers of the Streamlit file parser
+"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from utils.file_parser import count_sentences, count_words, get_text_statistics  # noqa: E402
+
+
+def test_count_sentences():
+    assert count_sentences("Hello. World!") == 3
+    assert count_sentences("") == 0
+
+
+def test_get_text_statistics():
+    stats = get_text_statistics("Hello. World!")
+
+    assert stats['characters'] == 13
+    assert stats['words'] == count_words("Hello. World!") == 2
+    assert stats['sentences'] == 3
+    assert get_text_statistics("")['sentences'] == 0
\ No newline at end of file
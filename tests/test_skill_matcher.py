@@ -0,0 +1,104 @@
+"""
+Regression checks for the Aho-Corasick skill matcher against the
+per-skill regular expressions it replaced
+"""
+
+import random
+import re
+
+from utils.skill_extractor import SKILL_DATABASE, extract_skills_with_confidence
+from utils.skill_matcher import SkillMatcher
+
+SKILLS = sorted({skill.lower() for skills in SKILL_DATABASE.values() for skill in skills})
+
+# Separators chosen to exercise word boundaries (\w vs non-\w, Unicode letters)
+SEPARATORS = [' ', '', '.', ',', '+', '-', '_', '\n', '(', ')', '/', 'x', 'é', '#']
+
+
+def random_texts(n, seed=1):
+    """Texts made of (possibly truncated or upper-cased) skills and separators"""
+    rnd = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rnd.randint(0, 60)):
+            skill = rnd.choice(SKILLS)
+            if rnd.random() < 0.3:
+                skill = skill[:rnd.randint(1, len(skill))]
+            if rnd.random() < 0.3:
+                skill = skill.upper()
+            parts.append(skill)
+            parts.append(rnd.choice(SEPARATORS))
+        texts.append(''.join(parts))
+    return texts + ['a.a.a', 'c++ and c#', 'i know c++, go-lang', 'aaa', '']
+
+
+def regex_counts(text):
+    """Word-bounded and substring counts the way the old extractor computed them"""
+    counts = {}
+    for skill_id, skill in enumerate(SKILLS):
+        exact = len(re.findall(r'\b' + re.escape(skill) + r'\b', text))
+        if exact or skill in text:
+            counts[skill_id] = (exact, skill in text)
+    return counts
+
+
+def regex_extract(text):
+    """The old per-skill regex extraction without the spaCy fallback"""
+    text_lower = text.lower()
+    extracted_skills = {}
+
+    for category, skills in SKILL_DATABASE.items():
+        category_skills = {}
+        for skill in skills:
+            exact_matches = len(re.findall(r'\b' + re.escape(skill.lower()) + r'\b', text_lower))
+            if exact_matches > 0:
+                category_skills[skill.title()] = min(95, 75 + (exact_matches * 5))
+            elif skill in text_lower:
+                category_skills[skill.title()] = 70
+
+        if category_skills:
+            sorted_skills = sorted(category_skills.items(), key=lambda x: x[1], reverse=True)
+            extracted_skills[category] = {
+                skill: max(75, int(conf * max(0.85, 1 - (i * 0.02))))
+                for i, (skill, conf) in enumerate(sorted_skills)
+            }
+
+    return extracted_skills
+
+
+def test_counts_match_per_skill_regex():
+    matcher = SkillMatcher(SKILLS)
+
+    for text in random_texts(300):
+        text = text.lower()
+        counts = {
+            skill_id: (exact, total > 0)
+            for skill_id, (exact, total) in matcher.match_counts(text).items()
+        }
+        assert counts == regex_counts(text), text
+
+
+def test_overlapping_patterns():
+    matcher = SkillMatcher(['java', 'javascript', 'script', 'c', 'c++'])
+    hits = sorted(matcher.find_all('javascript and c++'))
+
+    assert hits == [
+        (0, 0, 4, False),
+        (1, 0, 10, True),
+        (2, 4, 10, False),
+        (3, 5, 6, False),
+        (3, 15, 16, True),
+        # Like r'\bc\+\+\b', which never matches before a non-word char or the end
+        (4, 15, 18, False),
+    ]
+
+
+def test_word_bounded_hits_do_not_overlap():
+    # re.findall(r'\ba\.a\b', ...) never reports overlapping matches
+    assert SkillMatcher(['a.a']).match_counts('a.a.a') == {0: (1, 2)}
+
+
+def test_fast_extraction_matches_regex_extraction():
+    for text in random_texts(150, seed=2):
+        assert extract_skills_with_confidence(text, mode="fast", use_cache=False) == regex_extract(text), text
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Regression checks for chunked matching and extraction: results must not
+depend on where the text is cut
+"""
+
+import random
+
+from utils.skill_extractor import (
+    SKILL_DATABASE, _rechunk, extract_skills_streaming, extract_skills_with_confidence
+)
+from utils.skill_matcher import SkillMatcher
+
+SKILLS = sorted({skill.lower() for skills in SKILL_DATABASE.values() for skill in skills})
+SEPARATORS = [' ', '', '.', '+', '-', '\n', '#', 'é']
+
+
+def random_text(rnd):
+    return ''.join(
+        rnd.choice(SKILLS) + rnd.choice(SEPARATORS) for _ in range(rnd.randint(0, 40))
+    )
+
+
+def fixed_chunks(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def test_find_all_stream_small_chunks_match_whole_text():
+    matcher = SkillMatcher(SKILLS)
+    rnd = random.Random(5)
+
+    for _ in range(60):
+        text = random_text(rnd)
+        expected = sorted(matcher.find_all(text))
+        for size in range(1, 10):
+            assert sorted(matcher.find_all_stream(fixed_chunks(text, size))) == expected, (text, size)
+
+
+def test_find_all_stream_random_cuts_and_empty_chunks():
+    matcher = SkillMatcher(SKILLS)
+    rnd = random.Random(6)
+
+    for _ in range(200):
+        text = random_text(rnd)
+        cuts = sorted(rnd.choices(range(len(text) + 1), k=rnd.randint(0, 10)))
+        pieces = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+        hits = list(matcher.find_all_stream(pieces))
+        reference = list(matcher.find_all(text))
+        assert sorted(hits) == sorted(reference), (text, pieces)
+        assert matcher.count_hits(hits) == matcher.count_hits(reference)
+
+
+def test_boundary_char_in_next_chunk():
+    matcher = SkillMatcher(['java'])
+
+    # "java" ends a chunk; whether it is word-bounded depends on the next one
+    assert list(matcher.find_all_stream(['i use java', 'script'])) == [(0, 6, 10, False)]
+    assert list(matcher.find_all_stream(['i use java', ' daily'])) == [(0, 6, 10, True)]
+    assert list(matcher.find_all_stream(['i use java'])) == [(0, 6, 10, True)]
+
+
+def test_rechunk_preserves_text():
+    rnd = random.Random(7)
+
+    for _ in range(100):
+        text = random_text(rnd)
+        pieces = fixed_chunks(text, rnd.randint(1, 30))
+        size = rnd.randint(1, 50)
+        chunks = list(_rechunk(pieces, size))
+
+        assert ''.join(chunks) == text
+        assert all(len(chunk) == size for chunk in chunks[:-1])
+
+
+def test_streaming_extraction_matches_whole_text():
+    rnd = random.Random(8)
+
+    for _ in range(60):
+        text = random_text(rnd)
+        expected = extract_skills_with_confidence(text, mode="fast", use_cache=False)
+        for size in (1, 3, 7, 9, 64):
+            assert extract_skills_streaming(text, mode="fast", chunk_size=size) == expected, (text, size)
\ No newline at end of file